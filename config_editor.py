@@ -668,6 +668,30 @@ class ConfigEditorApp:
         self.gui_sprite_scale_info_label.pack(fill="x", anchor=tkinter.NW)
         self.gui_sprite_scale_slider.pack(fill="x", anchor=tkinter.NW)
 
+        self.gui_undo_steps_label = tkinter.Label(
+            self.gui_advanced_config_frame, anchor=tkinter.W,
+            text="Level designer undo steps — "
+                 + f"({self.parse_int('DESIGNER_UNDO_STEPS', 100)})"
+        )
+        self.gui_undo_steps_info_label = tkinter.Label(
+            self.gui_advanced_config_frame, anchor=tkinter.W, fg="blue",
+            text="Note: Higher values use more memory in the level designer"
+        )
+        self.scale_labels['DESIGNER_UNDO_STEPS'] = (
+            self.gui_undo_steps_label,
+            "Level designer undo steps — ({})"
+        )
+        self.gui_undo_steps_slider = tkinter.ttk.Scale(
+            self.gui_advanced_config_frame, from_=1, to=1000,
+            value=self.parse_int('DESIGNER_UNDO_STEPS', 100),
+            command=lambda x: self.on_scale_change(
+                'DESIGNER_UNDO_STEPS', x, 0
+            )
+        )
+        self.gui_undo_steps_label.pack(fill="x", anchor=tkinter.NW)
+        self.gui_undo_steps_info_label.pack(fill="x", anchor=tkinter.NW)
+        self.gui_undo_steps_slider.pack(fill="x", anchor=tkinter.NW)
+
         self.gui_save_button = tkinter.ttk.Button(
             self.window, command=self.save_config, text="Save"
         )
@@ -190,6 +190,13 @@ class Config:
             'SPRITE_SCALE_LIMIT', 750
         )
 
+        # The number of edits that the level designer can undo. The oldest
+        # steps are forgotten once this many are stored. Lowering this will
+        # reduce the amount of memory used while editing large levels.
+        self.designer_undo_steps = self._parse_int(
+            'DESIGNER_UNDO_STEPS', 100
+        )
+
     def _parse_int(self, field_name: str, default_value: int) -> int:
         if field_name not in self.config_options:
             return default_value
@@ -3,7 +3,11 @@ Contains the class definition for Level, which handles collision,
 player movement, victory checking, and path finding.
 """
 import random
-from typing import Any, Dict, List, no_type_check, Optional, Set, Tuple, Union
+from types import ModuleType
+from typing import (
+    Any, Dict, FrozenSet, Iterable, List, no_type_check, Optional, Set, Tuple,
+    Union
+)
 
 # Movement events
 MOVED = 0
@@ -21,6 +25,35 @@ PRESENCE = 0
 PLAYER_COLLIDE = 1
 MONSTER_COLLIDE = 2
 
+# Offsets to each adjacent tile, in the order path finding checks them
+CARDINAL_DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# The maximum number of find_all_paths results to remember per level.
+MAX_SOLUTION_CACHE_SIZE = 256
+
+# Level attributes that only hold results derived from the rest of the level.
+# They aren't kept when a level is pickled or copied, and are rebuilt when
+# they are next needed instead.
+CACHE_ATTRIBUTES = frozenset((
+    '_solution_cache', '_parents_cache', '_reach_cache',
+    '_flat_collision_maps', '_open_neighbours', '_base_rows', '_sight_limits'
+))
+
+# The raycasting module imports this one, so it can't be imported until this
+# module has finished loading. Use _get_raycasting to access it.
+_raycasting: Optional[ModuleType] = None
+
+
+def _get_raycasting() -> ModuleType:
+    """
+    Get the raycasting module, importing it the first time this is called.
+    """
+    global _raycasting
+    if _raycasting is None:
+        import raycasting  # Import is here to prevent circular import
+        _raycasting = raycasting
+    return _raycasting
+
 
 class Level:
     """
@@ -39,13 +72,29 @@ class Level:
     Note that the wall map may also contain 'True' values. These represent
     player placed walls and are only temporary.
     """
+    __slots__ = (
+        'dimensions', 'edge_wall_texture_name', 'wall_map', 'collision_map',
+        'start_point', 'player_coords', 'player_grid_coords', 'end_point',
+        'original_exit_keys', 'exit_keys', 'original_key_sensors',
+        'key_sensors', 'original_guns', 'guns', 'decorations',
+        'monster_coords', 'monster_start', 'monster_wait', 'player_flags',
+        '_last_monster_position', '_solution_cache', '_parents_cache',
+        '_reach_cache', '_flat_collision_maps', '_open_neighbours',
+        '_base_rows', '_wall_version', '_sight_limits', 'won', 'killed'
+    )
+
     def __init__(self, dimensions: Tuple[int, int],
                  wall_map: List[List[
                      Optional[Union[Tuple[str, str, str, str], bool]]
                  ]], collision_map: List[List[Tuple[bool, bool]]],
                  start_point: Tuple[int, int], end_point: Tuple[int, int],
-                 exit_keys: Set[Tuple[int, int]],
-                 key_sensors: Set[Tuple[int, int]], guns: Set[Tuple[int, int]],
+                 exit_keys: Union[
+                     Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]
+                 ],
+                 key_sensors: Union[
+                     Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]
+                 ],
+                 guns: Union[Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]],
                  decorations: Dict[Tuple[int, int], str],
                  monster: Optional[Tuple[int, int, float]],
                  edge_wall_texture_name: str):
@@ -53,7 +102,7 @@ class Level:
         self.edge_wall_texture_name = edge_wall_texture_name
 
         if (len(wall_map) != dimensions[1]
-                or sum(1 for x in wall_map if len(x) != dimensions[0]) != 0):
+                or any(len(x) != dimensions[0] for x in wall_map)):
             raise ValueError(
                 f"Wall map must be {dimensions[0]}x{dimensions[1]} points"
             )
@@ -62,105 +111,127 @@ class Level:
         ] = wall_map
 
         if (len(collision_map) != dimensions[1]
-                or sum(
-                    1 for x in collision_map if len(x) != dimensions[0]) != 0):
+                or any(len(x) != dimensions[0] for x in collision_map)):
             raise ValueError(
                 f"Collision map must be {dimensions[0]}x{dimensions[1]} points"
             )
         self.collision_map: List[List[Tuple[bool, bool]]] = collision_map
 
-        if not self.is_coord_in_bounds(start_point):
-            raise ValueError("Out of bounds start point coordinates")
-        if self[start_point, PRESENCE] or self[start_point, PLAYER_COLLIDE]:
-            raise ValueError(
-                "Start point cannot be inside wall or player collider"
-            )
+        self._check_placeable((start_point,), "start point")
         self.start_point = start_point
         # Start in the centre of the tile
         self.player_coords = (start_point[0] + 0.5, start_point[1] + 0.5)
         self.player_grid_coords = start_point
 
-        if not self.is_coord_in_bounds(end_point):
-            raise ValueError("Out of bounds end point coordinates")
-        if self[end_point, PRESENCE] or self[end_point, PLAYER_COLLIDE]:
-            raise ValueError(
-                "End point cannot be inside wall or player collider"
-            )
+        self._check_placeable((end_point,), "end point")
         self.end_point = end_point
 
-        for key in exit_keys:
-            if not self.is_coord_in_bounds(key):
-                raise ValueError("Out of bounds key coordinates")
-            if self[key, PRESENCE] or self[key, PLAYER_COLLIDE]:
-                raise ValueError(
-                    "Key cannot be inside wall or player collider"
-                )
+        self._check_placeable(exit_keys, "key")
         # Use a frozen set to prevent manipulation of original exit keys.
         self.original_exit_keys = frozenset(exit_keys)
-        self.exit_keys = exit_keys
+        # May be one of the frozen originals after the level is reset.
+        self.exit_keys: Union[
+            Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]
+        ] = exit_keys
 
-        for sensor in key_sensors:
-            if not self.is_coord_in_bounds(sensor):
-                raise ValueError("Out of bounds key sensor coordinates")
-            if self[sensor, PRESENCE] or self[sensor, PLAYER_COLLIDE]:
-                raise ValueError(
-                    "Key sensor cannot be inside wall or player collider"
-                )
+        self._check_placeable(key_sensors, "key sensor")
         # Use a frozen set to prevent manipulation of original key sensors.
         self.original_key_sensors = frozenset(key_sensors)
-        self.key_sensors = key_sensors
+        self.key_sensors: Union[
+            Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]
+        ] = key_sensors
 
-        for gun_pickup in guns:
-            if not self.is_coord_in_bounds(gun_pickup):
-                raise ValueError("Out of bounds gun coordinates")
-            if self[gun_pickup, PRESENCE] or self[gun_pickup, PLAYER_COLLIDE]:
-                raise ValueError(
-                    "Gun cannot be inside wall or player collider"
-                )
+        self._check_placeable(guns, "gun")
         # Use a frozen set to prevent manipulation of original guns
         self.original_guns = frozenset(guns)
-        self.guns = guns
+        self.guns: Union[
+            Set[Tuple[int, int]], FrozenSet[Tuple[int, int]]
+        ] = guns
 
-        for decor in decorations:
-            if not self.is_coord_in_bounds(decor[:2]):
-                raise ValueError("Out of bounds decoration coordinates")
-            if self[decor[:2], PRESENCE] or self[decor[:2], PLAYER_COLLIDE]:
-                raise ValueError(
-                    "Decoration cannot be inside wall or player collider"
-                )
+        self._check_placeable(decorations, "decoration")
         self.decorations = decorations
 
         self.monster_coords: Optional[Tuple[int, int]] = None
         if monster is not None:
             monster_start, monster_wait = monster[:2], monster[2]
-            if not self.is_coord_in_bounds(monster_start):
-                raise ValueError("Out of bounds monster start coordinates")
-            if (self[monster_start, PRESENCE]
-                    or self[monster_start, PLAYER_COLLIDE]):
-                raise ValueError(
-                    "Monster start cannot be inside wall or player collider"
-                )
+            self._check_placeable((monster_start,), "monster start")
             self.monster_start: Optional[Tuple[int, int]] = monster_start
             self.monster_wait: Optional[float] = monster_wait
         else:
             self.monster_start = None
             self.monster_wait = None
 
-        self.player_flags: Set[Tuple[int, int]] = set()
+        # Whether the player has placed a flag on each tile, indexed by [y][x]
+        self.player_flags: List[bytearray] = [
+            bytearray(dimensions[0]) for _ in range(dimensions[1])
+        ]
 
         # Used to prevent the monster from backtracking
         self._last_monster_position: Optional[Tuple[int, int]] = None
 
-        # Maps coordinates to a list of lists of coordinates represented
-        # possible paths from a previous player position. Saves on unnecessary
-        # repeated calculations.
-        self._solution_cache: Dict[
-            Tuple[int, int], List[List[Tuple[int, int]]]
-        ] = {}
+        # Incremented every time the level is changed through __setitem__, so
+        # that cached results can't be used once they may be out of date.
+        self._wall_version = 0
+        self._clear_caches()
 
         self.won = False
         self.killed = False
 
+    def _clear_caches(self) -> None:
+        """
+        Empty every attribute in CACHE_ATTRIBUTES, so that their contents are
+        worked out again when they are next needed.
+        """
+        # Maps a previous player position, set of targets, and wall version to
+        # a list of lists of coordinates representing every possible path
+        # between them. Saves on unnecessary repeated calculations. Ordered
+        # from least to most recently used.
+        self._solution_cache: Dict[
+            Tuple[Tuple[int, int], FrozenSet[Tuple[int, int]], int],
+            List[List[Tuple[int, int]]]
+        ] = {}
+        # Maps start points (the targets of find_possible_paths) to the result
+        # of a breadth first search from them. See the _get_path_parents
+        # method.
+        self._parents_cache: Dict[Tuple[int, int], List[int]] = {}
+        # Maps sets of targets to the dead end tiles that can never be part of
+        # a path to one of them. See the _find_dead_ends method.
+        self._reach_cache: Dict[
+            FrozenSet[Tuple[int, int]], Dict[int, Optional[int]]
+        ] = {}
+        # Whether the player and the monster collide with each tile
+        # respectively, indexed by y * width + x. Built on first use.
+        self._flat_collision_maps: Optional[Tuple[bytes, bytes]] = None
+        # The indices of the tiles next to each tile that the player can move
+        # into, indexed by y * width + x. Built on first use.
+        self._open_neighbours: Optional[List[List[int]]] = None
+        # The rows of the string representation of the maze with only the walls
+        # drawn. Built on first use.
+        self._base_rows: Optional[List[str]] = None
+        # The nearest tile to the right of and below each tile that the
+        # monster collides with. See the _get_sight_limits method.
+        self._sight_limits: Optional[Tuple[List[int], List[int]]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Get the attributes that a pickled or copied level is made from. Those
+        in CACHE_ATTRIBUTES are left out, as they can be rebuilt and may be
+        much larger than the level itself.
+        """
+        return {
+            name: getattr(self, name) for name in self.__slots__
+            if name not in CACHE_ATTRIBUTES
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled or copied level from the result of __getstate__,
+        starting with empty caches.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._clear_caches()
+
     @classmethod
     @no_type_check
     def from_json_dict(cls, json_dict: Dict[str, Any]) -> 'Level':
@@ -169,13 +240,31 @@ class Level:
         Converts lists (JSON arrays) back to tuples and sets, and converts
         applicable string keys back to tuples.
         """
+        # Levels reuse a small number of wall textures and there are only four
+        # possible collision states, so share a single tuple between every
+        # tile that is the same instead of keeping a copy for each of them.
+        wall_textures = {}
+
+        def shared_wall_textures(textures):
+            textures = tuple(textures)
+            return wall_textures.setdefault(textures, textures)
+
+        collision_states = (
+            ((False, False), (False, True)), ((True, False), (True, True))
+        )
         return cls(
             tuple(json_dict['dimensions']),
             [
-                [None if x is None else tuple(x) for x in y]
+                [
+                    None if x is None else shared_wall_textures(x)
+                    for x in y
+                ]
                 for y in json_dict['wall_map']
             ],
-            [[tuple(x) for x in y] for y in json_dict['collision_map']],
+            [
+                [collision_states[x[0]][x[1]] for x in y]
+                for y in json_dict['collision_map']
+            ],
             tuple(json_dict['start_point']), tuple(json_dict['end_point']),
             {tuple(x) for x in json_dict['exit_keys']},
             {tuple(x) for x in json_dict['key_sensors']},
@@ -229,26 +318,35 @@ class Level:
     def __str__(self) -> str:
         """
         Returns a string representation of the maze. '██' is a wall,
-        '  ' is empty space, 'PP' is the player, 'KK' are keys, 'SS' is the
-        start point, and 'EE' is the end point.
-        """
-        string = ""
-        for y, row in enumerate(self.wall_map):
-            for x, point in enumerate(row):
-                if self.player_grid_coords == (x, y):
-                    string += "PP"
-                elif self.monster_coords == (x, y):
-                    string += "MM"
-                elif (x, y) in self.exit_keys:
-                    string += "KK"
-                elif self.start_point == (x, y):
-                    string += "SS"
-                elif self.end_point == (x, y):
-                    string += "EE"
-                else:
-                    string += "██" if point is not None else "  "
-            string += "\n"
-        return string[:-1]
+        '  ' is empty space, 'PP' is the player, 'MM' is the monster, 'KK' are
+        keys, 'SS' is the start point, and 'EE' is the end point.
+        """
+        if self._base_rows is None:
+            self._base_rows = [
+                "".join("██" if point is not None else "  " for point in row)
+                for row in self.wall_map
+            ]
+        # Later entries take priority over earlier ones.
+        overlays = {self.end_point: "EE", self.start_point: "SS"}
+        overlays.update(dict.fromkeys(self.exit_keys, "KK"))
+        if self.monster_coords is not None:
+            overlays[self.monster_coords] = "MM"
+        overlays[self.player_grid_coords] = "PP"
+        # Split only the rows that have something drawn over them into
+        # individual tiles, then join each of them back together once.
+        overlaid_rows: Dict[int, List[str]] = {}
+        for (x, y), overlay in overlays.items():
+            if self.is_coord_in_bounds((x, y)):
+                if y not in overlaid_rows:
+                    base_row = self._base_rows[y]
+                    overlaid_rows[y] = [
+                        base_row[i:i + 2] for i in range(0, len(base_row), 2)
+                    ]
+                overlaid_rows[y][x] = overlay
+        rows = self._base_rows.copy()
+        for y, tiles in overlaid_rows.items():
+            rows[y] = "".join(tiles)
+        return "\n".join(rows)
 
     def __getitem__(self, index: Tuple[Tuple[float, float], int]
                     ) -> Optional[Union[Tuple[str, str, str, str], bool]]:
@@ -261,13 +359,18 @@ class Level:
         PRESENCE, otherwise a bool. A True value may also be returned for
         PRESENCE if a player placed wall is at the specified coordinate.
         """
-        grid_index = (index[0][0].__trunc__(), index[0][1].__trunc__())
+        grid_x, grid_y = index[0]
+        # Most lookups are already on the grid, so only convert if needed.
+        if type(grid_x) is not int:
+            grid_x = int(grid_x)
+        if type(grid_y) is not int:
+            grid_y = int(grid_y)
         if index[1] == PRESENCE:
-            return self.wall_map[grid_index[1]][grid_index[0]]
+            return self.wall_map[grid_y][grid_x]
         if index[1] == PLAYER_COLLIDE:
-            return self.collision_map[grid_index[1]][grid_index[0]][0]
+            return self.collision_map[grid_y][grid_x][0]
         if index[1] == MONSTER_COLLIDE:
-            return self.collision_map[grid_index[1]][grid_index[0]][1]
+            return self.collision_map[grid_y][grid_x][1]
         return None
 
     def __setitem__(self, index: Tuple[Tuple[int, int], int],
@@ -277,13 +380,19 @@ class Level:
         Change the texture of a wall or remove the wall entirely if PRESENCE
         is specified, or change the PLAYER_COLLIDE or MONSTER_COLLIDE status.
         """
+        self._wall_version += 1
         if index[1] == PRESENCE:
             self.wall_map[index[0][1]][index[0][0]] = value
+            self._base_rows = None
         elif index[1] == PLAYER_COLLIDE:
             if isinstance(value, bool):
                 self.collision_map[index[0][1]][index[0][0]] = (
                     value, self.collision_map[index[0][1]][index[0][0]][1]
                 )
+                self._reach_cache.clear()
+                self._parents_cache.clear()
+                self._flat_collision_maps = None
+                self._open_neighbours = None
             else:
                 raise TypeError("Collision map entries must be bool")
         elif index[1] == MONSTER_COLLIDE:
@@ -291,6 +400,8 @@ class Level:
                 self.collision_map[index[0][1]][index[0][0]] = (
                     self.collision_map[index[0][1]][index[0][0]][0], value
                 )
+                self._flat_collision_maps = None
+                self._sight_limits = None
             else:
                 raise TypeError("Collision map entries must be bool")
 
@@ -316,59 +427,62 @@ class Level:
                 self.player_coords[0] + vector[0],
                 self.player_coords[1] + vector[1]
             )
-            # Try moving just in X or Y if primary target cannot be moved to.
-            alternate_targets = [
-                (self.player_coords[0] + vector[0], self.player_coords[1]),
-                (self.player_coords[0], self.player_coords[1] + vector[1])
-            ]
         else:
             target = vector
+        if self.is_coord_in_bounds(target):
+            grid_coords = (int(target[0]), int(target[1]))
+            blocked = collision_check and self._player_collides(*grid_coords)
+        else:
+            blocked = True
+        if blocked:
+            # Try moving just in X, then just in Y, if primary target cannot
+            # be moved to.
             # There are no alternate movements if we aren't moving relatively.
-            alternate_targets = []
-        if not self.is_coord_in_bounds(target) or (
-                self[target, PLAYER_COLLIDE] and collision_check):
+            alternate_targets = [
+                (self.player_coords[0] + vector[0], self.player_coords[1]),
+                (self.player_coords[0], self.player_coords[1] + vector[1])
+            ] if relative else []
             found_valid = False
             for alt_move in alternate_targets:
-                if self.is_coord_in_bounds(alt_move) and (
-                        not self[alt_move, PLAYER_COLLIDE]
-                        or not collision_check):
+                if not self.is_coord_in_bounds(alt_move):
+                    continue
+                alt_grid_coords = (int(alt_move[0]), int(alt_move[1]))
+                if (not collision_check
+                        or not self._player_collides(*alt_grid_coords)):
                     target = alt_move
+                    grid_coords = alt_grid_coords
                     found_valid = True
                     events.add(ALTERNATE_COORD_CHOSEN)
+                    break
             if not found_valid:
                 return events
-        grid_coords = (target[0].__trunc__(), target[1].__trunc__())
-        relative_grid_pos = (
-            grid_coords[0] - self.player_grid_coords[0],
-            grid_coords[1] - self.player_grid_coords[1]
-        )
+        old_grid_x, old_grid_y = self.player_grid_coords
+        relative_grid_x = grid_coords[0] - old_grid_x
+        relative_grid_y = grid_coords[1] - old_grid_y
         # Moved diagonally therefore skipping a square, make sure that's valid.
-        if relative_grid_pos[0] and relative_grid_pos[1]:
-            if collision_check:
-                diagonal_path_free = False
-                if not self[(self.player_grid_coords[0] + relative_grid_pos[0],
-                            self.player_grid_coords[1]), PLAYER_COLLIDE]:
-                    diagonal_path_free = True
-                elif not self[(self.player_grid_coords[0],
-                              self.player_grid_coords[1]
-                              + relative_grid_pos[1]), PLAYER_COLLIDE]:
-                    diagonal_path_free = True
-                if not diagonal_path_free:
-                    return events
+        if relative_grid_x and relative_grid_y:
+            if collision_check and (
+                    self.collision_map[old_grid_y][
+                        old_grid_x + relative_grid_x][0]
+                    and self.collision_map[
+                        old_grid_y + relative_grid_y][old_grid_x][0]):
+                return events
             events.add(MOVED_GRID_DIAGONALLY)
         self.player_coords = target
         self.player_grid_coords = grid_coords
         events.add(MOVED)
+        # Pickup sets are frozen after a reset until something is picked up,
+        # so subtract from them instead of removing in place.
         if grid_coords in self.exit_keys:
-            self.exit_keys.remove(grid_coords)
+            self.exit_keys -= {grid_coords}
             events.add(PICKED_UP_KEY)
             events.add(PICKUP)
         if grid_coords in self.key_sensors:
-            self.key_sensors.remove(grid_coords)
+            self.key_sensors -= {grid_coords}
             events.add(PICKED_UP_KEY_SENSOR)
             events.add(PICKUP)
         if grid_coords in self.guns and not has_gun:
-            self.guns.remove(grid_coords)
+            self.guns -= {grid_coords}
             events.add(PICKED_UP_GUN)
             events.add(PICKUP)
         if grid_coords == self.monster_coords:
@@ -388,7 +502,7 @@ class Level:
         If the monster and the player occupy the same grid square, True will be
         returned, else False will be.
         """
-        import raycasting  # Import is here to prevent circular import
+        raycasting = _get_raycasting()
         last_monster_position = self.monster_coords
         if self.monster_start is None:
             return False
@@ -398,108 +512,207 @@ class Level:
                 ) >= 4 or coop)):
             self.monster_coords = self.monster_start
         elif self.monster_coords is not None:
-            # 0 — Not in line of sight.
-            # 1 — Line of sight on Y axis.
-            # 2 — Line of sight on X axis.
-            line_of_sight = 0
-            if not coop:
-                if self.player_grid_coords[0] == self.monster_coords[0]:
-                    min_y_coord = min(
-                        self.player_grid_coords[1], self.monster_coords[1]
-                    )
-                    max_y_coord = max(
-                        self.player_grid_coords[1], self.monster_coords[1]
-                    )
-                    collided = False
-                    for y_coord in range(min_y_coord, max_y_coord + 1):
-                        if self[(self.player_grid_coords[0], y_coord),
-                                MONSTER_COLLIDE]:
-                            collided = True
-                            break
-                    if not collided:
-                        line_of_sight = 1
-                elif self.player_grid_coords[1] == self.monster_coords[1]:
-                    min_x_coord = min(
-                        self.player_grid_coords[0], self.monster_coords[0]
-                    )
-                    max_x_coord = max(
-                        self.player_grid_coords[0], self.monster_coords[0]
-                    )
-                    collided = False
-                    for x_coord in range(min_x_coord, max_x_coord + 1):
-                        if self[(x_coord, self.player_grid_coords[1]),
-                                MONSTER_COLLIDE]:
-                            collided = True
-                            break
-                    if not collided:
-                        line_of_sight = 2
+            monster_x, monster_y = self.monster_coords
+            player_x, player_y = self.player_grid_coords
+            # There can only be line of sight if the player and monster share
+            # a row or column.
+            if coop or (player_x != monster_x and player_y != monster_y):
+                line_of_sight = 0
+            else:
+                line_of_sight = self._line_of_sight(
+                    self.player_grid_coords, self.monster_coords
+                )
             if line_of_sight == 1:
-                if self.player_grid_coords[1] > self.monster_coords[1]:
-                    self.monster_coords = (
-                        self.monster_coords[0], self.monster_coords[1] + 1
-                    )
-                else:
-                    self.monster_coords = (
-                        self.monster_coords[0], self.monster_coords[1] - 1
-                    )
+                monster_y += 1 if player_y > monster_y else -1
+                self.monster_coords = (monster_x, monster_y)
             elif line_of_sight == 2:
-                if self.player_grid_coords[0] > self.monster_coords[0]:
-                    self.monster_coords = (
-                        self.monster_coords[0] + 1, self.monster_coords[1]
-                    )
-                else:
-                    self.monster_coords = (
-                        self.monster_coords[0] - 1, self.monster_coords[1]
-                    )
+                monster_x += 1 if player_x > monster_x else -1
+                self.monster_coords = (monster_x, monster_y)
             else:
-                # Randomise order of each cardinal direction, then move to
-                # the first one available.
-                shuffled_vectors = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-                random.shuffle(shuffled_vectors)
-                for vector in shuffled_vectors:
-                    target = (
-                        self.monster_coords[0] + vector[0],
-                        self.monster_coords[1] + vector[1]
-                    )
-                    if (self.is_coord_in_bounds(target)
-                            and not self[target, MONSTER_COLLIDE]
-                            and self._last_monster_position != target):
-                        self.monster_coords = target
-                        break
+                # Move to a random one of the available cardinal directions.
+                monster_collide = self._get_flat_collision_maps()[1]
+                padded_width = self.dimensions[0] + 2
+                # The border around the flat collision map means there is no
+                # need to check that each target is in bounds.
+                available_targets = [
+                    (monster_x + x_offset, monster_y + y_offset)
+                    for x_offset, y_offset in CARDINAL_DIRECTIONS
+                    if not monster_collide[
+                        (monster_y + y_offset + 1) * padded_width
+                        + monster_x + x_offset + 1
+                    ]
+                ]
+                if self._last_monster_position in available_targets:
+                    available_targets.remove(self._last_monster_position)
+                if len(available_targets) > 0:
+                    self.monster_coords = random.choice(available_targets)
         self._last_monster_position = last_monster_position
-        if self.monster_coords in self.player_flags and random.random() < 0.25:
-            self.player_flags.remove(self.monster_coords)
+        if self.monster_coords is not None:
+            monster_x, monster_y = self.monster_coords
+            if (self.player_flags[monster_y][monster_x]
+                    and random.random() < 0.25):
+                self.player_flags[monster_y][monster_x] = 0
         return self.monster_coords == self.player_grid_coords
 
-    def find_possible_paths(self) -> List[List[Tuple[int, int]]]:
+    def _line_of_sight(self, first: Tuple[int, int], second: Tuple[int, int]
+                       ) -> int:
+        """
+        Determine whether there is an unobstructed view for the monster
+        between two coordinates along one of the cardinal directions.
+        Returns 0 if there is no line of sight, 1 if there is line of sight on
+        the Y axis, or 2 if there is line of sight on the X axis.
+        """
+        next_collide_right, next_collide_down = self._get_sight_limits()
+        width = self.dimensions[0]
+        if first[0] == second[0]:
+            # The first tile in the column from the top point downwards that
+            # blocks sight has to be past the bottom point.
+            top, bottom = sorted((first[1], second[1]))
+            if next_collide_down[top * width + first[0]] > bottom:
+                return 1
+        elif first[1] == second[1]:
+            # The first tile in the row from the left point rightwards that
+            # blocks sight has to be past the right point.
+            left, right = sorted((first[0], second[0]))
+            if next_collide_right[first[1] * width + left] > right:
+                return 2
+        return 0
+
+    def find_possible_paths(self, max_paths: Optional[int] = None,
+                            max_length: Optional[int] = None
+                            ) -> List[List[Tuple[int, int]]]:
+        """
+        Finds the shortest path to each of the current target(s) from the
+        player's current position. The returned result is sorted by path
+        length in ascending order (i.e. the shortest path is first), and will
+        not contain paths to targets that cannot be reached or that the player
+        is already on.
+        If max_paths is given, only that many of the shortest paths will be
+        returned. If max_length is given, only paths with up to that many
+        points (including the player's current position) will be returned.
+        Use find_all_paths to find every possible path instead.
+        """
+        targets = (
+            {self.end_point} if len(self.exit_keys) == 0 else self.exit_keys
+        )
+        width = self.dimensions[0]
+        start_index = (
+            self.player_grid_coords[1] * width + self.player_grid_coords[0]
+        )
+        # Searches from each target don't need to be repeated every time the
+        # player moves, only when the level itself changes.
+        if self._player_collides(*self.player_grid_coords):
+            # Nothing can move into a tile the player collides with, so the
+            # searches will never reach the player if collision is disabled,
+            # but the player can still move out of it.
+            first_steps = self._get_open_neighbours()[start_index]
+        else:
+            first_steps = [start_index]
+        result: List[List[Tuple[int, int]]] = []
+        for target in targets:
+            if target == self.player_grid_coords:
+                # A target the player is already on needs no path to it.
+                continue
+            if self._player_collides(*target):
+                # Searches from a target still spread out of it even if it
+                # has since been walled off, so it has to be skipped here.
+                continue
+            target_index = target[1] * width + target[0]
+            parents = self._get_path_parents(target)
+            shortest_path: Optional[List[Tuple[int, int]]] = None
+            for index in first_steps:
+                if parents[index] == -1:
+                    continue
+                path = [self.player_grid_coords]
+                if index != start_index:
+                    path.append((index % width, index // width))
+                while index != target_index:
+                    index = parents[index]
+                    path.append((index % width, index // width))
+                if shortest_path is None or len(path) < len(shortest_path):
+                    shortest_path = path
+            if shortest_path is not None and (
+                    max_length is None or len(shortest_path) <= max_length):
+                result.append(shortest_path)
+        result.sort(key=len)
+        return result[:max_paths]
+
+    def find_all_paths(self, max_paths: Optional[int] = None,
+                       max_length: Optional[int] = None
+                       ) -> List[List[Tuple[int, int]]]:
         """
         Finds all possible paths to the current target(s) from the player's
         current position. The returned result is sorted by path length in
         ascending order (i.e. the shortest path is first). Potentially very
         computationally expensive.
+        If max_paths is given, the search will stop once that many paths have
+        been found, so the paths returned are not guaranteed to be the
+        shortest ones. If max_length is given, only paths with up to that many
+        points (including the player's current position) will be found.
         """
         targets = (
             {self.end_point} if len(self.exit_keys) == 0 else self.exit_keys
         )
-        if self.player_grid_coords in self._solution_cache:
+        cache_key = (
+            self.player_grid_coords, frozenset(targets), self._wall_version
+        )
+        if cache_key in self._solution_cache:
+            # Move the result to the end to mark it as the most recently used.
+            cached_paths = self._solution_cache.pop(cache_key)
+            self._solution_cache[cache_key] = cached_paths
+            # Paths are sorted by length, so there is nothing to filter out if
+            # the last one is short enough.
+            if (max_length is None or len(cached_paths) == 0
+                    or len(cached_paths[-1]) <= max_length):
+                return cached_paths[:max_paths]
             return [
-                x for x in self._solution_cache[self.player_grid_coords]
-                if x[-1] in targets
-            ]
-        result = sorted(
-            self._path_search([self.player_grid_coords], targets), key=len
+                x for x in cached_paths if len(x) <= max_length
+            ][:max_paths]
+        width = self.dimensions[0]
+        start_index = (
+            self.player_grid_coords[1] * width + self.player_grid_coords[0]
         )
-        self._solution_cache[self.player_grid_coords] = result
+        # Tiles that are already part of the current path or can never be
+        # part of a path to a target, indexed by y * width + x.
+        blocked = bytearray(width * self.dimensions[1])
+        blocked[start_index] = 1
+        if not self._player_collides(*self.player_grid_coords):
+            dead_ends = self._find_dead_ends(frozenset(targets))
+            # The player may be inside a dead end themselves, in which case the
+            # route back out of it still needs to be searched.
+            escape_route: Set[int] = set()
+            index: Optional[int] = start_index
+            while index in dead_ends and index not in escape_route:
+                escape_route.add(index)
+                index = dead_ends[index]
+            for dead_end in dead_ends.keys() - escape_route:
+                blocked[dead_end] = 1
+        is_target = bytearray(width * self.dimensions[1])
+        for target in targets:
+            is_target[target[1] * width + target[0]] = 1
+        found_paths: List[List[Tuple[int, int]]] = []
+        self._path_search(
+            start_index, is_target, blocked, found_paths, max_paths, max_length
+        )
+        result = sorted(found_paths, key=len)
+        # Incomplete results can't be reused for future searches.
+        if max_paths is None and max_length is None:
+            if len(self._solution_cache) >= MAX_SOLUTION_CACHE_SIZE:
+                del self._solution_cache[next(iter(self._solution_cache))]
+            self._solution_cache[cache_key] = result
         return result
 
     def reset(self) -> None:
         """
         Reset this level to its original state
         """
-        self.exit_keys = set(self.original_exit_keys)
-        self.key_sensors = set(self.original_key_sensors)
-        self.guns = set(self.original_guns)
-        self.player_flags = set()
+        # The originals are frozen so they can be shared until one changes.
+        self.exit_keys = self.original_exit_keys
+        self.key_sensors = self.original_key_sensors
+        self.guns = self.original_guns
+        self.player_flags = [
+            bytearray(self.dimensions[0]) for _ in range(self.dimensions[1])
+        ]
         self.player_coords = (
             self.start_point[0] + 0.5, self.start_point[1] + 0.5
         )
@@ -523,33 +736,234 @@ class Level:
         multiplayer for (re)spawning.
         """
         new_coord = None
-        while new_coord is None or self[new_coord, PLAYER_COLLIDE]:
+        while new_coord is None or self._player_collides(
+                int(new_coord[0]), int(new_coord[1])):
             new_coord = (
                 random.randint(0, self.dimensions[0] - 1) + 0.5,
                 random.randint(0, self.dimensions[1] - 1) + 0.5
             )
         self.move_player(new_coord, False, False, False, True)
 
-    def _path_search(self, current_path: List[Tuple[int, int]],
-                     targets: Set[Tuple[int, int]]
-                     ) -> List[List[Tuple[int, int]]]:
+    def _check_placeable(self, points: Iterable[Tuple[int, int]], name: str
+                         ) -> None:
         """
-        Recursively find all possible paths to a list of targets. Use the
-        find_possible_paths method instead of this one for finding paths
-        to the player's target(s).
+        Raise a ValueError if any of the given points are out of bounds, or
+        inside a wall or player collider. name is used to describe the points
+        in the error message.
         """
-        found_paths: List[List[Tuple[int, int]]] = []
-        for x_offset, y_offset in ((0, -1), (1, 0), (0, 1), (-1, 0)):
-            point = (
-                current_path[-1][0] + x_offset,
-                current_path[-1][1] + y_offset
+        width, height = self.dimensions
+        for point in points:
+            x, y = point[0], point[1]
+            if not 0 <= x < width or not 0 <= y < height:
+                raise ValueError(f"Out of bounds {name} coordinates")
+            if self.wall_map[y][x] or self.collision_map[y][x][0]:
+                raise ValueError(
+                    f"{name.capitalize()} cannot be inside wall or player "
+                    + "collider"
+                )
+
+    def _player_collides(self, x: int, y: int) -> bool:
+        """
+        Check whether the player should collide with the tile at the given
+        integer grid coordinates. Skips the overhead of __getitem__ for
+        internal use.
+        """
+        return self.collision_map[y][x][0]
+
+    def _get_flat_collision_maps(self) -> Tuple[bytes, bytes]:
+        """
+        Get whether the player and the monster collide with each tile in the
+        level as two flat sequences of 0s and 1s. The level is surrounded by a
+        border of tiles that always collide, so that looking at a neighbour of
+        any tile never needs a bounds check, meaning that each sequence is
+        indexed by (y + 1) * (width + 2) + x + 1. Built on first use and then
+        cached until the collision map changes.
+        """
+        if self._flat_collision_maps is None:
+            width, height = self.dimensions
+            padded_width = width + 2
+            player_collide = bytearray(b"\x01") * (
+                padded_width * (height + 2)
             )
-            if not self.is_coord_in_bounds(point) or self[
-                    point, PLAYER_COLLIDE] or point in current_path:
-                continue
-            if point in targets:
-                found_paths.append(current_path + [point])
-            found_paths += self._path_search(
-                current_path + [point], targets
+            monster_collide = player_collide.copy()
+            for y, row in enumerate(self.collision_map):
+                row_start = (y + 1) * padded_width + 1
+                player_collide[row_start:row_start + width] = bytes(
+                    point[0] for point in row
+                )
+                monster_collide[row_start:row_start + width] = bytes(
+                    point[1] for point in row
+                )
+            self._flat_collision_maps = (
+                bytes(player_collide), bytes(monster_collide)
             )
-        return found_paths
+        return self._flat_collision_maps
+
+    def _get_sight_limits(self) -> Tuple[List[int], List[int]]:
+        """
+        Get the X coordinate of the first tile at or to the right of each tile
+        that the monster collides with, and the Y coordinate of the first tile
+        at or below each tile that the monster collides with, indexed by
+        y * width + x. The width or height of the level is used respectively if
+        there is no such tile. Built on first use and then cached until the
+        monster collision map changes.
+        """
+        if self._sight_limits is None:
+            width, height = self.dimensions
+            next_collide_right = [width] * (width * height)
+            next_collide_down = [height] * (width * height)
+            for y in range(height - 1, -1, -1):
+                row = self.collision_map[y]
+                limit = width
+                for x in range(width - 1, -1, -1):
+                    if row[x][1]:
+                        limit = x
+                    next_collide_right[y * width + x] = limit
+            for x in range(width):
+                limit = height
+                for y in range(height - 1, -1, -1):
+                    if self.collision_map[y][x][1]:
+                        limit = y
+                    next_collide_down[y * width + x] = limit
+            self._sight_limits = (next_collide_right, next_collide_down)
+        return self._sight_limits
+
+    def _get_open_neighbours(self) -> List[List[int]]:
+        """
+        Get the tiles next to each tile in the level that the player can move
+        into. Both the result and the tiles in it are indexed by
+        y * width + x. Built on first use and then cached until the player
+        collision map changes.
+        """
+        if self._open_neighbours is None:
+            width, height = self.dimensions
+            player_collide = self._get_flat_collision_maps()[0]
+            padded_width = width + 2
+            self._open_neighbours = [
+                [
+                    (y + y_offset) * width + x + x_offset
+                    for x_offset, y_offset in CARDINAL_DIRECTIONS
+                    if not player_collide[
+                        (y + y_offset + 1) * padded_width + x + x_offset + 1
+                    ]
+                ]
+                for y in range(height)
+                for x in range(width)
+            ]
+        return self._open_neighbours
+
+    def _get_path_parents(self, start: Tuple[int, int]) -> List[int]:
+        """
+        Perform a breadth first search of the level from the given start
+        point. For every tile, indexed by y * width + x, the result contains
+        the index of the previous tile on the shortest path to it from the
+        start point, or -1 if the tile cannot be reached. The start point is
+        its own previous tile. Results are cached for each start point until
+        the player collision map changes.
+        """
+        if start in self._parents_cache:
+            return self._parents_cache[start]
+        width = self.dimensions[0]
+        all_neighbours = self._get_open_neighbours()
+        start_index = start[1] * width + start[0]
+        parents = [-1] * (width * self.dimensions[1])
+        parents[start_index] = start_index
+        # Tiles are added to the end of the queue while it is iterated over.
+        queue = [start_index]
+        for index in queue:
+            for neighbour_index in all_neighbours[index]:
+                if parents[neighbour_index] == -1:
+                    parents[neighbour_index] = index
+                    queue.append(neighbour_index)
+        self._parents_cache[start] = parents
+        return parents
+
+    def _find_dead_ends(self, targets: FrozenSet[Tuple[int, int]]
+                        ) -> Dict[int, Optional[int]]:
+        """
+        Find every tile that can never be part of a path to any of the given
+        targets, as it is inside a dead end with only a single way in or out.
+        Each of these tiles is mapped to the tile that leads back out of the
+        dead end, or None if the tile is entirely enclosed. All tiles in the
+        result are indexed by y * width + x.
+        Results are cached for each set of targets until the player collision
+        map changes.
+        """
+        if targets in self._reach_cache:
+            return self._reach_cache[targets]
+        all_neighbours = self._get_open_neighbours()
+        width = self.dimensions[0]
+        target_indices = {y * width + x for x, y in targets}
+        open_neighbours = {
+            index: set(neighbours)
+            for index, neighbours in enumerate(all_neighbours)
+            if not self._player_collides(index % width, index // width)
+        }
+        # Repeatedly fill in tiles with at most one open neighbour until only
+        # corridors that lead somewhere (or to a target) remain.
+        dead_ends: Dict[int, Optional[int]] = {}
+        to_check = [
+            index for index, neighbours in open_neighbours.items()
+            if len(neighbours) <= 1
+        ]
+        while len(to_check) > 0:
+            index = to_check.pop()
+            if (index in target_indices or index in dead_ends
+                    or len(open_neighbours[index]) > 1):
+                continue
+            exit_index = next(iter(open_neighbours[index]), None)
+            dead_ends[index] = exit_index
+            if exit_index is not None:
+                open_neighbours[exit_index].discard(index)
+                if len(open_neighbours[exit_index]) <= 1:
+                    to_check.append(exit_index)
+        self._reach_cache[targets] = dead_ends
+        return dead_ends
+
+    def _path_search(self, start_index: int, is_target: bytearray,
+                     blocked: bytearray,
+                     found_paths: List[List[Tuple[int, int]]],
+                     max_paths: Optional[int], max_length: Optional[int]
+                     ) -> None:
+        """
+        Find all possible paths from a start tile to a list of targets and add
+        them to found_paths, stopping once max_paths paths have been found.
+        start_index and the flags in is_target and blocked are indexed by
+        y * width + x. is_target is set for each target, and blocked is set
+        for tiles that cannot be entered, and will also have the flags for
+        tiles in the current path set while searching. Use the
+        find_possible_paths method instead of this one for finding paths to
+        the player's target(s).
+        """
+        if max_length is not None and max_length < 2:
+            return
+        width = self.dimensions[0]
+        open_neighbours = self._get_open_neighbours()
+        current_path = [start_index]
+        # Each tile in the current path has an iterator over the neighbours of
+        # it that are yet to be searched, so the search can be resumed from
+        # the previous tile once every route from the current one is done.
+        untried_neighbours = [iter(open_neighbours[start_index])]
+        while untried_neighbours:
+            index = next(untried_neighbours[-1], None)
+            if index is None:
+                untried_neighbours.pop()
+                last_index = current_path.pop()
+                if untried_neighbours:
+                    blocked[last_index] = 0
+                continue
+            if blocked[index]:
+                continue
+            if is_target[index]:
+                # Tiles only need to be converted back to coordinates once a
+                # complete path has been found.
+                found_paths.append([
+                    (path_index % width, path_index // width)
+                    for path_index in current_path
+                ] + [(index % width, index // width)])
+                if max_paths is not None and len(found_paths) >= max_paths:
+                    return
+            if max_length is None or len(current_path) + 1 < max_length:
+                blocked[index] = 1
+                current_path.append(index)
+                untried_neighbours.append(iter(open_neighbours[index]))
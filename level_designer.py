@@ -4,12 +4,19 @@ level JSON files easily.
 """
 import copy
 import os
+import pickle
+import queue
+import threading
 import tkinter
 import tkinter.filedialog
 import tkinter.messagebox
 import tkinter.ttk
+from collections import deque
+from dataclasses import dataclass
 from glob import glob
-from typing import Dict, List, Optional, Tuple
+from typing import (Any, Callable, ClassVar, Deque, Dict, FrozenSet,
+                    Iterable, Iterator, List, Mapping, Optional, Set, Tuple,
+                    Union)
 
 import config_loader
 import level
@@ -31,6 +38,16 @@ GUN = 9
 MONSTER = 10
 DECORATION = 11
 
+# The name used for each tool by its icon file and in the descriptions file.
+# {name: tool}
+TOOL_NAMES = {
+    "select": SELECT, "move": MOVE, "wall": WALL,
+    "collision_player": COLLISION_PLAYER,
+    "collision_monster": COLLISION_MONSTER, "start": START, "end": END,
+    "key": KEY, "sensor": SENSOR, "gun": GUN, "monster": MONSTER,
+    "decoration": DECORATION
+}
+
 
 def rgb_to_hex(red: int, green: int, blue: int) -> str:
     """
@@ -39,22 +56,172 @@ def rgb_to_hex(red: int, green: int, blue: int) -> str:
     return f'#{red:02x}{green:02x}{blue:02x}'
 
 
-def is_tile_free(maze_level: level.Level, tile: Tuple[int, int]) -> bool:
+# Every colour drawn by the designer, converted to hex only once.
+# {rgb_colour: hex_colour}
+HEX_COLOURS: Dict[Tuple[int, int, int], str] = {
+    x: rgb_to_hex(*x) for x in (
+        screen_drawing.WHITE, screen_drawing.BLACK, screen_drawing.GOLD,
+        screen_drawing.DARK_GOLD, screen_drawing.GREY, screen_drawing.PURPLE,
+        screen_drawing.DARK_RED, screen_drawing.RED, screen_drawing.GREEN,
+        screen_drawing.DARK_GREEN
+    )
+}
+
+
+# The Level attribute holding the set of tiles edited by each tool that places
+# an item which can appear on many tiles. {tool: attribute_name}
+TILE_SET_ATTRIBUTES = {
+    KEY: "original_exit_keys",
+    SENSOR: "original_key_sensors",
+    GUN: "original_guns"
+}
+
+# The colour that the object placed by each tool is drawn with on the map
+# canvas. {tool: rgb_colour}
+TOOL_COLOURS: Dict[int, Tuple[int, int, int]] = {
+    KEY: screen_drawing.GOLD,
+    SENSOR: screen_drawing.DARK_GOLD,
+    GUN: screen_drawing.GREY,
+    DECORATION: screen_drawing.PURPLE,
+    MONSTER: screen_drawing.DARK_RED,
+    START: screen_drawing.RED,
+    END: screen_drawing.GREEN
+}
+
+
+def get_tile_roles(maze_level: level.Level) -> Dict[Tuple[int, int], int]:
+    """
+    Get every tile in a level that has an object on it, mapped to the tool
+    that places that object. If a tile has more than one object on it, the
+    one that is drawn on the map canvas is used.
+    """
+    # Objects are added from the lowest priority to the highest, so that
+    # higher priority objects overwrite lower ones.
+    tile_roles = {maze_level.end_point: END, maze_level.start_point: START}
+    if maze_level.monster_start is not None:
+        tile_roles[maze_level.monster_start] = MONSTER
+    tile_roles.update(dict.fromkeys(maze_level.decorations, DECORATION))
+    tile_roles.update(dict.fromkeys(maze_level.original_guns, GUN))
+    tile_roles.update(dict.fromkeys(maze_level.original_key_sensors, SENSOR))
+    tile_roles.update(dict.fromkeys(maze_level.original_exit_keys, KEY))
+    return tile_roles
+
+
+def is_tile_free(maze_level: level.Level, tile: Tuple[int, int],
+                 tile_roles: Optional[Dict[Tuple[int, int], int]] = None
+                 ) -> bool:
     """
     Determine whether a particular tile in a level is free to have a wall
-    placed on it.
+    placed on it. If the result of get_tile_roles for the level is already
+    known, it can be given as tile_roles to avoid working it out again.
     """
     if not maze_level.is_coord_in_bounds(tile):
         return False
-    if tile in (
-            maze_level.start_point, maze_level.end_point,
-            maze_level.monster_start):
-        return False
-    if tile in (
-            maze_level.original_exit_keys | maze_level.original_key_sensors
-            | maze_level.original_guns | maze_level.decorations.keys()):
-        return False
-    return True
+    if tile_roles is None:
+        tile_roles = get_tile_roles(maze_level)
+    return tile not in tile_roles
+
+
+def level_list_text(index: int, maze_level: level.Level) -> str:
+    """
+    Get the text shown for a level in the level ListBox.
+    """
+    return (
+        f"Level {index + 1} - "
+        + f"{maze_level.dimensions[0]}x{maze_level.dimensions[1]}"
+    )
+
+
+@dataclass
+class LevelChanges:
+    """
+    The previous values of only the parts of a level that were changed by an
+    edit, so that it can be undone without storing a copy of the whole level.
+    """
+    # {attribute_name: previous_value}
+    attributes: Dict[str, Any]
+    # {tile: (previous_wall, previous_collision)}
+    tiles: Dict[Tuple[int, int], Tuple[
+        Optional[Union[Tuple[str, str, str, str], bool]], Tuple[bool, bool]
+    ]]
+
+    @classmethod
+    def record(cls, maze_level: level.Level, attributes: Iterable[str],
+               tiles: Iterable[Tuple[int, int]]) -> 'LevelChanges':
+        """
+        Store the current values of the given attributes and tiles of a level
+        before they are changed.
+        """
+        return cls(
+            {
+                name: copy.copy(getattr(maze_level, name))
+                for name in attributes
+            },
+            {
+                tile: (
+                    maze_level[tile, level.PRESENCE],
+                    maze_level.collision_map[tile[1]][tile[0]]
+                )
+                for tile in tiles
+            }
+        )
+
+    def merge_later(self, later_changes: 'LevelChanges') -> None:
+        """
+        Add the previous values from changes recorded after this one, so
+        that both are undone together. Values already stored here are older,
+        so they are kept for anything that both changed.
+        """
+        for name, value in later_changes.attributes.items():
+            self.attributes.setdefault(name, value)
+        for tile, previous in later_changes.tiles.items():
+            self.tiles.setdefault(tile, previous)
+
+    def restore(self, maze_level: level.Level) -> None:
+        """
+        Put the stored values back into the level that they were taken from.
+        """
+        for name, value in self.attributes.items():
+            setattr(maze_level, name, value)
+        for tile, (wall, (player_collide, monster_collide)) in (
+                self.tiles.items()):
+            # Set through the level so that it knows the maps have changed.
+            maze_level[tile, level.PRESENCE] = wall
+            maze_level[tile, level.PLAYER_COLLIDE] = player_collide
+            maze_level[tile, level.MONSTER_COLLIDE] = monster_collide
+
+
+class LazyImageDict(Mapping[str, tkinter.PhotoImage]):
+    """
+    A read-only dictionary of names to tkinter images, where each image is
+    only loaded from disk the first time that it is accessed.
+    """
+    def __init__(self, image_paths: Dict[str, str],
+                 loaded_images: Optional[Dict[str, tkinter.PhotoImage]] = None
+                 ) -> None:
+        # {name: file_path}
+        self._image_paths = image_paths
+        # {file_path: PhotoImage}. Can be shared between instances so that
+        # an image used by more than one is only loaded once.
+        self._loaded_images = {} if loaded_images is None else loaded_images
+
+    def __getitem__(self, name: str) -> tkinter.PhotoImage:
+        """
+        Get the image with the given name, loading it if this is the first
+        time that it has been needed.
+        """
+        path = self._image_paths[name]
+        image = self._loaded_images.get(path)
+        if image is None:
+            image = tkinter.PhotoImage(file=path)
+            self._loaded_images[path] = image
+        return image
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._image_paths)
+
+    def __len__(self) -> int:
+        return len(self._image_paths)
 
 
 class LevelDesignerApp:
@@ -63,6 +230,12 @@ class LevelDesignerApp:
     level JSON files. The game will always load from 'maze_levels.json',
     however you can load and save to wherever you like with this editor.
     """
+    # Files that don't change while the game is running are only read the
+    # first time that a designer is opened, then reused by later ones.
+    _descriptions: ClassVar[Optional[Dict[int, str]]] = None
+    # {directory: {name: file_path}}
+    _image_paths: ClassVar[Dict[str, Dict[str, str]]] = {}
+
     def __init__(self, root: tkinter.Tk, config_file_path: str = "config.ini"
                  ) -> None:
         # Change working directory to the directory where the script is located
@@ -80,9 +253,68 @@ class LevelDesignerApp:
         self.last_visited_tile = (-1, -1)
         self.zoom_level = 1.0
         self.scroll_offset = (0, 0)
-        # [(current_level, [Level, ...]), ...]
-        self.undo_stack: List[Tuple[int, List[level.Level]]] = []
+        # [(current_level, changed_level_index, pickled_level(s)_or_changes)]
+        # changed_level_index is None if the entire list of levels was saved.
+        # The oldest steps are forgotten once the configured limit is reached.
+        self.undo_stack: Deque[Tuple[
+            int, Optional[int], Union[bytes, LevelChanges]
+        ]] = deque(
+            maxlen=max(self._cfg.designer_undo_steps, 1)
+        )
         self.unsaved_changes = False
+        # The level, dimensions, scroll offset, and tile size that the map
+        # canvas was last fully drawn with.
+        self._canvas_layout: Optional[Tuple[
+            level.Level, Tuple[int, int], Tuple[int, int], int, int
+        ]] = None
+        # Canvas item IDs (0 if the tile is still drawn as part of the
+        # initial canvas) and the last drawn (fill, outline, colliders) for
+        # each visible tile, indexed [y][x] relative to the scroll offset.
+        self._tile_items: List[List[int]] = []
+        self._tile_looks: List[List[Tuple[str, str, Tuple[bool, bool]]]] = []
+        # The canvas co-ordinates of the edges of each visible tile column and
+        # row, recalculated only when the canvas is rebuilt.
+        self._tile_xs: List[int] = []
+        self._tile_ys: List[int] = []
+        # The result of get_tile_size and the (dimensions, zoom_level) it was
+        # worked out for.
+        self._tile_size = (0, 0)
+        self._tile_size_key: Optional[Tuple[Tuple[int, int], float]] = None
+        # {(x, y, collider_index): canvas_item_id}
+        self._collider_items: Dict[Tuple[int, int, int], int] = {}
+        # The result of get_tile_roles for _tile_roles_level. Set to None
+        # whenever a level may have been edited.
+        self._tile_roles: Optional[Dict[Tuple[int, int], int]] = None
+        self._tile_roles_level: Optional[level.Level] = None
+        # The hex colour of every tile in _tile_roles, worked out again only
+        # once _tile_roles has been replaced.
+        self._role_fills: Dict[Tuple[int, int], str] = {}
+        self._role_fills_source: Optional[Dict[Tuple[int, int], int]] = None
+        # IDs of pending after_idle calls for slider changes, so that a burst
+        # of slider events is applied only once.
+        self._dimensions_update: Optional[str] = None
+        self._monster_time_update: Optional[str] = None
+        self._pending_monster_time = "0"
+        # ID of the pending after_idle call from schedule_redraw, and whether
+        # that call also needs to update the level ListBox.
+        self._redraw_update: Optional[str] = None
+        self._level_list_outdated = False
+        # The text of every row currently in the level ListBox.
+        self._level_list_texts: List[str] = []
+        # Whether the slider being moved has already added to the undo stack.
+        # A single drag should only be undone once.
+        self._slider_undo_taken = False
+        # The undo step that every edit made by the current mouse drag across
+        # the map canvas is added to, as a single drag should also only be
+        # undone once. _map_drag_editing is True while a tool is editing.
+        self._map_drag_undo: Optional[LevelChanges] = None
+        self._map_drag_editing = False
+        # Files are loaded and saved by a worker thread, which reports back
+        # with a single (operation, file_path, levels_or_exception) tuple.
+        self._io_queue: queue.Queue = queue.Queue()
+        self._io_thread: Optional[threading.Thread] = None
+        # ID of the pending after call that checks _io_queue.
+        self._io_poll: Optional[str] = None
         # Used to prevent methods from being called when programmatically
         # setting widget values.
         self.do_updates = True
@@ -94,38 +326,31 @@ class LevelDesignerApp:
         )
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-        with open("level_designer_descriptions.txt") as file:
-            # {CONSTANT_VALUE: description}
-            self.descriptions: Dict[int, str] = {
-                globals()[x.split("|")[0].upper()]: x.split("|")[1]
-                for x in file.read().strip().splitlines()
-            }
-        self.textures: Dict[str, tkinter.PhotoImage] = {
-            os.path.split(x)[-1].split(".")[0]: tkinter.PhotoImage(file=x)
-            for x in glob(os.path.join("textures", "wall", "*.png"))
-        }
-        self.textures["placeholder"] = (
-            tkinter.PhotoImage(
-                file=os.path.join("textures", "placeholder.png")
-            )
-        )
-
-        self.decoration_textures: Dict[str, tkinter.PhotoImage] = {
-            os.path.split(x)[-1].split(".")[0]: tkinter.PhotoImage(file=x)
-            for x in glob(os.path.join(
-                "textures", "sprite", "decoration", "*.png"))
-        }
-        self.decoration_textures["placeholder"] = (
-            tkinter.PhotoImage(
-                file=os.path.join("textures", "placeholder.png")
-            )
+        # {CONSTANT_VALUE: description}
+        self.descriptions = self._load_descriptions()
+        # Textures are only loaded once they are shown in a preview.
+        # {file_path: PhotoImage}
+        loaded_images: Dict[str, tkinter.PhotoImage] = {}
+        placeholder_path = os.path.join("textures", "placeholder.png")
+        self.textures = LazyImageDict(
+            {
+                **self._find_images("textures", "wall"),
+                "placeholder": placeholder_path
+            },
+            loaded_images
+        )
+        self.decoration_textures = LazyImageDict(
+            {
+                **self._find_images("textures", "sprite", "decoration"),
+                "placeholder": placeholder_path
+            },
+            loaded_images
         )
 
         # {CONSTANT_VALUE: PhotoImage}
         self.tool_icons: Dict[int, tkinter.PhotoImage] = {
-            globals()[os.path.split(x)[-1].split(".")[0].upper()]:
-                tkinter.PhotoImage(file=x)
-            for x in glob(os.path.join("designer_icons", "*.png"))
+            TOOL_NAMES[name.lower()]: tkinter.PhotoImage(file=path)
+            for name, path in self._find_images("designer_icons").items()
         }
         self.tool_icons[-1] = tkinter.PhotoImage()
 
@@ -248,6 +473,22 @@ class LevelDesignerApp:
             'w', lambda _: self.select_tool(self.current_tool - 1)
         )
         self.window.bind('a', self.bulk_select_all_walls)
+        # The methods that edit a clicked tile for each tool that changes the
+        # level. {tool: method(current_level, clicked_tile) -> level_changed}
+        self._tool_handlers: Dict[
+            int, Callable[[level.Level, Tuple[int, int]], bool]
+        ] = {
+            WALL: self._toggle_wall,
+            COLLISION_PLAYER: self._toggle_player_collision,
+            COLLISION_MONSTER: self._toggle_monster_collision,
+            START: self._move_start_point,
+            END: self._move_end_point,
+            KEY: self._toggle_tile_set_item,
+            SENSOR: self._toggle_tile_set_item,
+            GUN: self._toggle_tile_set_item,
+            MONSTER: self._toggle_monster,
+            DECORATION: self._toggle_decoration
+        }
 
         self.gui_map_canvas = tkinter.Canvas(
             self.gui_map_frame, width=self._cfg.viewport_width + 1,
@@ -290,6 +531,9 @@ class LevelDesignerApp:
         self.gui_decoration_texture_frame = tkinter.Frame(
             self.gui_properties_frame
         )
+        # Kept up to date by set_frame_packed so that Tk doesn't need to be
+        # asked which frames are currently shown.
+        self._packed_frames: Set[tkinter.Frame] = set()
 
         self.gui_dimension_width_label = tkinter.Label(
             self.gui_dimension_frame, anchor=tkinter.W
@@ -320,6 +564,14 @@ class LevelDesignerApp:
         )
         self.gui_monster_wait_slider.pack(padx=2, pady=2, fill="x")
 
+        # Scales can be moved by any mouse button as well as the keyboard, so
+        # every press starts a new slider movement with its own undo entry.
+        for slider in (self.gui_dimension_width_slider,
+                       self.gui_dimension_height_slider,
+                       self.gui_monster_wait_slider):
+            slider.bind("<ButtonPress>", self.slider_pressed)
+            slider.bind("<KeyPress>", self.slider_pressed)
+
         self.texture_direction_variable = tkinter.IntVar(
             value=raycasting.NORTH
         )
@@ -474,6 +726,39 @@ class LevelDesignerApp:
 
         self.window.wait_window()
 
+    @classmethod
+    def _load_descriptions(cls) -> Dict[int, str]:
+        """
+        Get the description of each tool from the descriptions file, only
+        reading it the first time that this is called.
+        """
+        if cls._descriptions is None:
+            with open("level_designer_descriptions.txt") as file:
+                # {CONSTANT_VALUE: description}
+                cls._descriptions = {
+                    TOOL_NAMES[name.lower()]: description
+                    for name, description in (
+                        x.split("|", 1)
+                        for x in file.read().strip().splitlines()
+                    )
+                }
+        return cls._descriptions
+
+    @classmethod
+    def _find_images(cls, *directory: str) -> Dict[str, str]:
+        """
+        Get the path to every PNG image in a directory, keyed by file name
+        without its extension. The directory is only searched the first time
+        that this is called for it.
+        """
+        directory_path = os.path.join(*directory)
+        if directory_path not in cls._image_paths:
+            cls._image_paths[directory_path] = {
+                os.path.basename(x).split(".")[0]: x
+                for x in glob(os.path.join(directory_path, "*.png"))
+            }
+        return cls._image_paths[directory_path]
+
     def open_file(self) -> None:
         """
         Prompt the user to select a JSON file then load it, overwriting the
@@ -492,8 +777,84 @@ class LevelDesignerApp:
         if not os.path.isfile(filepath):
             tkinter.messagebox.showerror("Not found", "File does not exist")
             return
+        self._start_io(self._load_worker, filepath)
+
+    def save_file(self, filepath: Optional[str] = None) -> None:
+        """
+        Prompt the user to provide a location to save a JSON file then do so.
+        If filepath is given, the user file prompt will be skipped.
+        """
+        if filepath is None or filepath == "":
+            filepath = tkinter.filedialog.asksaveasfilename(
+                filetypes=[("JSON files", '*.json')]
+            )
+        if filepath == "":
+            return
+        # The levels are copied so that they can continue to be edited while
+        # the file is being written. Any edits made during the save will mark
+        # the file as unsaved again.
+        levels = pickle.loads(
+            pickle.dumps(self.levels, pickle.HIGHEST_PROTOCOL)
+        )
+        self.unsaved_changes = False
+        self._start_io(self._save_worker, filepath, levels)
+
+    def _start_io(self, worker: Callable[..., None], *args: object) -> None:
+        """
+        Run a file loading or saving worker on a separate thread so that the
+        window stays responsive, disabling the file buttons until it is done.
+        """
+        for button in (self.gui_open_button, self.gui_save_button,
+                       self.gui_save_as_button):
+            button.config(state=tkinter.DISABLED)
+        self._io_thread = threading.Thread(
+            target=worker, args=args, daemon=True
+        )
+        self._io_thread.start()
+        self._io_poll = self.window.after(30, self._poll_io_queue)
+
+    def _load_worker(self, filepath: str) -> None:
+        """
+        Load a level JSON file and report the result back to the main thread.
+        Must not use any tkinter widgets.
+        """
+        try:
+            levels = maze_levels.load_level_json(filepath)
+        except Exception as e:
+            self._io_queue.put(("load_error", filepath, e))
+            return
+        self._io_queue.put(("loaded", filepath, levels))
+
+    def _save_worker(self, filepath: str, levels: List[level.Level]
+                     ) -> None:
+        """
+        Save levels to a JSON file and report the result back to the main
+        thread. Must not use any tkinter widgets.
+        """
+        try:
+            maze_levels.save_level_json(filepath, levels)
+        except Exception as e:
+            self._io_queue.put(("save_error", filepath, e))
+            return
+        self._io_queue.put(("saved", filepath, None))
+
+    def _poll_io_queue(self) -> None:
+        """
+        Apply the result of the running file worker if it has finished,
+        otherwise check again shortly.
+        """
         try:
-            self.levels = maze_levels.load_level_json(filepath)
+            operation, filepath, result = self._io_queue.get_nowait()
+        except queue.Empty:
+            self._io_poll = self.window.after(30, self._poll_io_queue)
+            return
+        self._io_poll = None
+        self._io_thread = None
+        for button in (self.gui_open_button, self.gui_save_button,
+                       self.gui_save_as_button):
+            button.config(state=tkinter.NORMAL)
+        if operation == "loaded":
+            self.levels = result
             self.current_path = filepath
             self.window.wm_title(f"Level Designer - {filepath}")
             self.current_level = -1
@@ -504,151 +865,298 @@ class LevelDesignerApp:
             self.do_updates = False
             self.gui_map_zoom_slider.set(1.0)
             self.do_updates = True
-            self.undo_stack = []
+            self.undo_stack.clear()
             self.gui_undo_button.config(state=tkinter.DISABLED)
             self.unsaved_changes = False
-            self.update_level_list()
-            self.update_map_canvas()
-            self.update_properties_frame()
-        except Exception as e:
+            self.schedule_redraw(True)
+        elif operation == "load_error":
             tkinter.messagebox.showerror(
                 "Error",
                 "An error occurred loading the file.\n"
                 + "Is it definitely a valid levels file?\n\n"
-                + f"The following info was given: {repr(e)}"
+                + f"The following info was given: {repr(result)}"
             )
-            return
-
-    def save_file(self, filepath: Optional[str] = None) -> None:
-        """
-        Prompt the user to provide a location to save a JSON file then do so.
-        If filepath is given, the user file prompt will be skipped.
-        """
-        if filepath is None or filepath == "":
-            filepath = tkinter.filedialog.asksaveasfilename(
-                filetypes=[("JSON files", '*.json')]
-            )
-        if filepath == "":
-            return
-        try:
-            maze_levels.save_level_json(filepath, self.levels)
+        elif operation == "saved":
             self.window.wm_title(f"Level Designer - {filepath}")
             self.current_path = filepath
-            self.unsaved_changes = False
-        except Exception as e:
+        else:
+            self.unsaved_changes = True
             tkinter.messagebox.showerror(
                 "Error",
                 "An error occurred saving the file.\n"
-                + f"The following info was given: {repr(e)}"
+                + f"The following info was given: {repr(result)}"
             )
-            return
 
     def update_map_canvas(self) -> None:
         """
-        Draw the current level to the map canvas.
+        Draw the current level to the map canvas. Every tile is only redrawn
+        if the level or its position on the canvas has changed, otherwise
+        just the tiles that look different to last time are updated.
         """
         if not self.do_updates:
             return
-        self.gui_map_canvas.delete(tkinter.ALL)
         if self.current_level < 0:
+            self.gui_map_canvas.delete(tkinter.ALL)
+            self._canvas_layout = None
             return
         current_level = self.levels[self.current_level]
-        tile_width = (
-            self._cfg.viewport_width // max(
-                (current_level.dimensions[0] * self.zoom_level).__trunc__(), 1
-            )
-        )
-        tile_height = (
-            self._cfg.viewport_height // max(
-                (current_level.dimensions[1] * self.zoom_level).__trunc__(), 1
-            )
-        )
-        tiles_to_redraw: List[Tuple[int, int, int, int, str, str]] = []
-        for y, row in enumerate(
-                current_level.wall_map[self.scroll_offset[1]:]):
-            for x, point in enumerate(row[self.scroll_offset[0]:]):
+        tile_width, tile_height = self.get_tile_size(current_level.dimensions)
+        layout = (
+            current_level, current_level.dimensions, self.scroll_offset,
+            tile_width, tile_height
+        )
+        visible_fills = self._get_visible_fills(current_level)
+        if layout != self._canvas_layout:
+            self._rebuild_map_canvas(visible_fills, tile_width, tile_height)
+            self._canvas_layout = layout
+        bulk_selection = set(self.bulk_wall_selection)
+        default_outline = HEX_COLOURS[screen_drawing.BLACK]
+        selected_items: List[int] = []
+        restack = False
+        for y, fill_row in enumerate(visible_fills):
+            collider_row = current_level.collision_map[
+                y + self.scroll_offset[1]
+            ]
+            top = self._tile_ys[y]
+            bottom = self._tile_ys[y + 1]
+            for x, fill in enumerate(fill_row):
                 tile_coord = (
                     x + self.scroll_offset[0], y + self.scroll_offset[1]
                 )
-                if tile_coord in current_level.original_exit_keys:
-                    colour = screen_drawing.GOLD
-                elif tile_coord in current_level.original_key_sensors:
-                    colour = screen_drawing.DARK_GOLD
-                elif tile_coord in current_level.original_guns:
-                    colour = screen_drawing.GREY
-                elif tile_coord in current_level.decorations:
-                    colour = screen_drawing.PURPLE
-                elif current_level.monster_start == tile_coord:
-                    colour = screen_drawing.DARK_RED
-                elif current_level.start_point == tile_coord:
-                    colour = screen_drawing.RED
-                elif current_level.end_point == tile_coord:
-                    colour = screen_drawing.GREEN
-                else:
-                    colour = (
-                        screen_drawing.BLACK
-                        if point is not None else
-                        screen_drawing.WHITE
-                    )
                 if self.current_tile == tile_coord:
-                    tiles_to_redraw.append((
-                        tile_width * x + 2, tile_height * y + 2,
-                        tile_width * (x + 1) + 2, tile_height * (y + 1) + 2,
-                        rgb_to_hex(*colour), rgb_to_hex(*screen_drawing.RED)
-                    ))
-                elif (x, y) in self.bulk_wall_selection:
-                    tiles_to_redraw.append((
-                        tile_width * x + 2, tile_height * y + 2,
-                        tile_width * (x + 1) + 2, tile_height * (y + 1) + 2,
-                        rgb_to_hex(*colour), rgb_to_hex(*screen_drawing.GREEN)
-                    ))
+                    outline = HEX_COLOURS[screen_drawing.RED]
+                elif (x, y) in bulk_selection:
+                    outline = HEX_COLOURS[screen_drawing.GREEN]
                 else:
-                    self.gui_map_canvas.create_rectangle(
-                        tile_width * x + 2, tile_height * y + 2,
-                        tile_width * (x + 1) + 2, tile_height * (y + 1) + 2,
-                        fill=rgb_to_hex(*colour)
-                    )
-        # Redraw the selected tile(s) to keep the entire outline on top.
-        for tile in tiles_to_redraw:
+                    outline = default_outline
+                collider = collider_row[tile_coord[0]]
+                old_look = self._tile_looks[y][x]
+                if (fill, outline) != old_look[:2]:
+                    # Tiles that no longer look like they did when the canvas
+                    # was built get their own rectangle drawn over the top.
+                    if self._tile_items[y][x] == 0:
+                        self._tile_items[y][x] = (
+                            self.gui_map_canvas.create_rectangle(
+                                self._tile_xs[x], top,
+                                self._tile_xs[x + 1], bottom,
+                                fill=fill, outline=outline
+                            )
+                        )
+                        restack = True
+                    else:
+                        self.gui_map_canvas.itemconfig(
+                            self._tile_items[y][x], fill=fill,
+                            outline=outline
+                        )
+                        restack = restack or old_look[1] != outline
+                if collider != old_look[2]:
+                    if collider[0] != old_look[2][0]:
+                        if collider[0]:
+                            self._collider_items[x, y, 0] = (
+                                self.gui_map_canvas.create_oval(
+                                    self._tile_xs[x] + 1,
+                                    bottom - 2 - tile_height // 8,
+                                    self._tile_xs[x] + 1 + tile_width // 8,
+                                    bottom - 2,
+                                    fill=HEX_COLOURS[
+                                        screen_drawing.DARK_GREEN
+                                    ],
+                                    tags="collider"
+                                )
+                            )
+                        else:
+                            self.gui_map_canvas.delete(
+                                self._collider_items.pop((x, y, 0))
+                            )
+                    if collider[1] != old_look[2][1]:
+                        if collider[1]:
+                            self._collider_items[x, y, 1] = (
+                                self.gui_map_canvas.create_oval(
+                                    self._tile_xs[x + 1] - 2
+                                    - tile_width // 8,
+                                    bottom - 2 - tile_height // 8,
+                                    self._tile_xs[x + 1] - 2,
+                                    bottom - 2,
+                                    fill=HEX_COLOURS[screen_drawing.RED],
+                                    tags="collider"
+                                )
+                            )
+                        else:
+                            self.gui_map_canvas.delete(
+                                self._collider_items.pop((x, y, 1))
+                            )
+                    restack = True
+                self._tile_looks[y][x] = (fill, outline, collider)
+                if outline != default_outline:
+                    selected_items.append(self._tile_items[y][x])
+        if restack:
+            # Keep the entire outline of the selected tile(s) on top, with
+            # collision indicators above everything.
+            for item in selected_items:
+                self.gui_map_canvas.tag_raise(item)
+            self.gui_map_canvas.tag_raise("collider")
+
+    def get_tile_size(self, dimensions: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Get the width and height in pixels of each tile on the map canvas for
+        a level with the given dimensions at the current zoom level. Only
+        worked out again once the dimensions or zoom level are different.
+        """
+        tile_size_key = (dimensions, self.zoom_level)
+        if tile_size_key != self._tile_size_key:
+            self._tile_size = (
+                self._cfg.viewport_width // max(
+                    (dimensions[0] * self.zoom_level).__trunc__(), 1
+                ),
+                self._cfg.viewport_height // max(
+                    (dimensions[1] * self.zoom_level).__trunc__(), 1
+                )
+            )
+            self._tile_size_key = tile_size_key
+        return self._tile_size
+
+    def _rebuild_map_canvas(self, visible_fills: List[List[str]],
+                            tile_width: int, tile_height: int) -> None:
+        """
+        Clear the map canvas and draw every visible tile again, using the
+        result of _get_visible_fills.
+        Empty tiles are all covered by one background rectangle, horizontal
+        runs of other tiles with the same colour are filled by a single
+        rectangle, and the outlines of every tile are drawn as one grid,
+        keeping the number of canvas items as low as possible.
+        """
+        self.gui_map_canvas.delete(tkinter.ALL)
+        default_outline = HEX_COLOURS[screen_drawing.BLACK]
+        self._tile_items = []
+        self._tile_looks = []
+        self._collider_items = {}
+        rows = len(visible_fills)
+        columns = len(visible_fills[0]) if rows > 0 else 0
+        self._tile_xs = [tile_width * x + 2 for x in range(columns + 1)]
+        self._tile_ys = [tile_height * y + 2 for y in range(rows + 1)]
+        empty_fill = HEX_COLOURS[screen_drawing.WHITE]
+        if columns > 0 and rows > 0:
             self.gui_map_canvas.create_rectangle(
-                *tile[:4], fill=tile[4], outline=tile[5]
+                2, 2, self._tile_xs[-1], self._tile_ys[-1],
+                fill=empty_fill, outline=""
             )
-        for y, collider_row in enumerate(
-                current_level.collision_map[self.scroll_offset[1]:]):
-            for x, collider in enumerate(collider_row[self.scroll_offset[0]:]):
-                if collider[0]:
-                    self.gui_map_canvas.create_oval(
-                        tile_width * x + 3,
-                        tile_height * y + (tile_height - tile_height // 8),
-                        tile_width * x + tile_width // 8 + 3,
-                        tile_height * (y + 1),
-                        fill=rgb_to_hex(*screen_drawing.DARK_GREEN)
-                    )
-                if collider[1]:
-                    self.gui_map_canvas.create_oval(
-                        tile_width * x + (tile_width - tile_width // 8),
-                        tile_height * y + (tile_height - tile_height // 8),
-                        tile_width * (x + 1), tile_height * (y + 1),
-                        fill=rgb_to_hex(*screen_drawing.RED)
-                    )
+        for y, fills in enumerate(visible_fills):
+            run_start = 0
+            for x in range(1, columns + 1):
+                if x == columns or fills[x] != fills[run_start]:
+                    if fills[run_start] != empty_fill:
+                        self.gui_map_canvas.create_rectangle(
+                            self._tile_xs[run_start], self._tile_ys[y],
+                            self._tile_xs[x], self._tile_ys[y + 1],
+                            fill=fills[run_start], outline=""
+                        )
+                    run_start = x
+            self._tile_items.append([0] * columns)
+            self._tile_looks.append([
+                (fill, default_outline, (False, False)) for fill in fills
+            ])
+        # Zig-zag through every line of the grid so that each direction can
+        # be drawn with a single canvas item.
+        vertical_points: List[int] = []
+        for x, line_x in enumerate(self._tile_xs):
+            vertical_points.extend((
+                line_x, self._tile_ys[-1] if x % 2 else 2,
+                line_x, 2 if x % 2 else self._tile_ys[-1]
+            ))
+        horizontal_points: List[int] = []
+        for y, line_y in enumerate(self._tile_ys):
+            horizontal_points.extend((
+                self._tile_xs[-1] if y % 2 else 2, line_y,
+                2 if y % 2 else self._tile_xs[-1], line_y
+            ))
+        if columns > 0 and rows > 0:
+            self.gui_map_canvas.create_line(
+                vertical_points, fill=default_outline
+            )
+            self.gui_map_canvas.create_line(
+                horizontal_points, fill=default_outline
+            )
+
+    def _get_visible_fills(self, current_level: level.Level
+                           ) -> List[List[str]]:
+        """
+        Get the hex colour of every tile in the current level that is drawn
+        on the map canvas, indexed [y][x] relative to the scroll offset.
+        """
+        tile_roles = self._get_tile_roles()
+        if self._role_fills_source is not tile_roles:
+            self._role_fills = {
+                tile: HEX_COLOURS[TOOL_COLOURS[role]]
+                for tile, role in tile_roles.items()
+            }
+            self._role_fills_source = tile_roles
+        role_fills = self._role_fills
+        wall_fill = HEX_COLOURS[screen_drawing.BLACK]
+        empty_fill = HEX_COLOURS[screen_drawing.WHITE]
+        return [
+            [
+                role_fills.get(
+                    (x, y), empty_fill if point is None else wall_fill
+                )
+                for x, point in enumerate(
+                    row[self.scroll_offset[0]:], self.scroll_offset[0]
+                )
+            ]
+            for y, row in enumerate(
+                current_level.wall_map[self.scroll_offset[1]:],
+                self.scroll_offset[1]
+            )
+        ]
 
     def update_level_list(self) -> None:
         """
-        Update level ListBox with the current state of all the levels.
+        Update level ListBox with the current state of all the levels. Only
+        the rows with text that has changed are replaced.
         """
         if not self.do_updates:
             return
         self.do_updates = False
-        self.gui_level_select.delete(0, tkinter.END)
-        for index, maze_level in enumerate(self.levels):
+        new_texts = [
+            level_list_text(index, maze_level)
+            for index, maze_level in enumerate(self.levels)
+        ]
+        old_texts = self._level_list_texts
+        if len(old_texts) > len(new_texts):
+            self.gui_level_select.delete(len(new_texts), tkinter.END)
+        for index, (old_text, new_text) in enumerate(
+                zip(old_texts, new_texts)):
+            if old_text != new_text:
+                self.gui_level_select.delete(index)
+                self.gui_level_select.insert(index, new_text)
+        if len(new_texts) > len(old_texts):
             self.gui_level_select.insert(
-                tkinter.END, f"Level {index + 1} - "
-                + f"{maze_level.dimensions[0]}x{maze_level.dimensions[1]}"
+                tkinter.END, *new_texts[len(old_texts):]
             )
+        self._level_list_texts = new_texts
+        self.gui_level_select.selection_clear(0, tkinter.END)
         if 0 <= self.current_level < len(self.levels):
             self.gui_level_select.selection_set(self.current_level)
         self.do_updates = True
 
+    def update_level_list_row(self, index: int) -> None:
+        """
+        Update a single row of the level ListBox with the current state of
+        the level at that index, leaving every other row untouched. Only
+        usable when no levels have been added, removed, or moved.
+        """
+        if not self.do_updates or self._level_list_outdated:
+            # Any pending update of the whole list will include this row.
+            return
+        self.do_updates = False
+        self._level_list_texts[index] = level_list_text(
+            index, self.levels[index]
+        )
+        self.gui_level_select.delete(index)
+        self.gui_level_select.insert(index, self._level_list_texts[index])
+        if index == self.current_level:
+            self.gui_level_select.selection_set(index)
+        self.do_updates = True
+
     def update_properties_frame(self) -> None:
         """
         Update the properties frame with information about the selected tile.
@@ -660,19 +1168,13 @@ class LevelDesignerApp:
             self.gui_selected_square_description.config(
                 bg="#f0f0f0", fg="black", text="Nothing is currently selected"
             )
-            if self.gui_dimension_frame.winfo_ismapped():
-                self.gui_dimension_frame.forget()
-            if self.gui_monster_wait_frame.winfo_ismapped():
-                self.gui_monster_wait_frame.forget()
-            if self.gui_texture_frame.winfo_ismapped():
-                self.gui_texture_frame.forget()
-            if self.gui_edge_texture_frame.winfo_ismapped():
-                self.gui_edge_texture_frame.forget()
-            if self.gui_decoration_texture_frame.winfo_ismapped():
-                self.gui_decoration_texture_frame.forget()
+            for frame in (self.gui_dimension_frame,
+                          self.gui_monster_wait_frame, self.gui_texture_frame,
+                          self.gui_edge_texture_frame,
+                          self.gui_decoration_texture_frame):
+                self.set_frame_packed(frame, False)
             return
-        if not self.gui_dimension_frame.winfo_ismapped():
-            self.gui_dimension_frame.pack(padx=2, pady=2, fill="x")
+        self.set_frame_packed(self.gui_dimension_frame, True)
         current_level = self.levels[self.current_level]
         self.do_updates = False
         self.gui_dimension_width_label.config(
@@ -684,16 +1186,9 @@ class LevelDesignerApp:
         )
         self.gui_dimension_height_slider.set(current_level.dimensions[1])
         self.do_updates = True
-        # Remove all property widgets that apply to only a certain type of
-        # grid square.
-        if self.gui_monster_wait_frame.winfo_ismapped():
-            self.gui_monster_wait_frame.forget()
-        if self.gui_texture_frame.winfo_ismapped():
-            self.gui_texture_frame.forget()
-        if self.gui_edge_texture_frame.winfo_ismapped():
-            self.gui_edge_texture_frame.forget()
-        if self.gui_decoration_texture_frame.winfo_ismapped():
-            self.gui_decoration_texture_frame.forget()
+        # The property widgets that apply to only the selected type of grid
+        # square. All others are removed.
+        shown_frame: Optional[tkinter.Frame] = None
         if -1 in self.current_tile:
             self.gui_selected_square_description.config(
                 bg="#f0f0f0", fg="black", text="Nothing is currently selected"
@@ -701,27 +1196,24 @@ class LevelDesignerApp:
         elif self.current_tile in current_level.original_exit_keys:
             self.gui_selected_square_description.config(
                 text=self.descriptions[KEY],
-                bg=rgb_to_hex(*screen_drawing.GOLD), fg="black"
+                bg=HEX_COLOURS[screen_drawing.GOLD], fg="black"
             )
         elif self.current_tile in current_level.original_key_sensors:
             self.gui_selected_square_description.config(
                 text=self.descriptions[SENSOR],
-                bg=rgb_to_hex(*screen_drawing.DARK_GOLD), fg="white"
+                bg=HEX_COLOURS[screen_drawing.DARK_GOLD], fg="white"
             )
         elif self.current_tile in current_level.original_guns:
             self.gui_selected_square_description.config(
                 text=self.descriptions[GUN],
-                bg=rgb_to_hex(*screen_drawing.GREY), fg="black"
+                bg=HEX_COLOURS[screen_drawing.GREY], fg="black"
             )
         elif self.current_tile in current_level.decorations:
             self.gui_selected_square_description.config(
                 text=self.descriptions[DECORATION],
-                bg=rgb_to_hex(*screen_drawing.PURPLE), fg="white"
+                bg=HEX_COLOURS[screen_drawing.PURPLE], fg="white"
             )
-            if not self.gui_decoration_texture_frame.winfo_ismapped():
-                self.gui_decoration_texture_frame.pack(
-                    padx=2, pady=2, fill="x"
-                )
+            shown_frame = self.gui_decoration_texture_frame
             self.do_updates = False
             self.gui_decoration_texture_dropdown.set(
                 current_level.decorations[self.current_tile]
@@ -735,9 +1227,9 @@ class LevelDesignerApp:
         elif current_level.monster_start == self.current_tile:
             self.gui_selected_square_description.config(
                 text=self.descriptions[MONSTER],
-                bg=rgb_to_hex(*screen_drawing.DARK_RED), fg="white"
+                bg=HEX_COLOURS[screen_drawing.DARK_RED], fg="white"
             )
-            self.gui_monster_wait_frame.pack(padx=2, pady=2, fill="x")
+            shown_frame = self.gui_monster_wait_frame
             if current_level.monster_wait is not None:
                 self.do_updates = False
                 self.gui_monster_wait_label.config(
@@ -751,23 +1243,20 @@ class LevelDesignerApp:
         elif current_level.start_point == self.current_tile:
             self.gui_selected_square_description.config(
                 text=self.descriptions[START],
-                bg=rgb_to_hex(*screen_drawing.RED), fg="white"
+                bg=HEX_COLOURS[screen_drawing.RED], fg="white"
             )
         elif current_level.end_point == self.current_tile:
             self.gui_selected_square_description.config(
                 text=self.descriptions[END],
-                bg=rgb_to_hex(*screen_drawing.GREEN), fg="black"
+                bg=HEX_COLOURS[screen_drawing.GREEN], fg="black"
             )
         else:
             if current_level[self.current_tile, level.PRESENCE] is not None:
                 self.gui_selected_square_description.config(
                     text=self.descriptions[WALL],
-                    bg=rgb_to_hex(*screen_drawing.BLACK), fg="white"
+                    bg=HEX_COLOURS[screen_drawing.BLACK], fg="white"
                 )
-                if not self.gui_texture_frame.winfo_ismapped():
-                    self.gui_texture_frame.pack(
-                        padx=2, pady=2, fill="x"
-                    )
+                shown_frame = self.gui_texture_frame
                 current_tile = current_level[self.current_tile, level.PRESENCE]
                 if isinstance(current_tile, tuple):
                     self.do_updates = False
@@ -783,12 +1272,9 @@ class LevelDesignerApp:
             else:
                 self.gui_selected_square_description.config(
                     text=self.descriptions[SELECT],
-                    bg=rgb_to_hex(*screen_drawing.WHITE), fg="black"
+                    bg=HEX_COLOURS[screen_drawing.WHITE], fg="black"
                 )
-                if not self.gui_edge_texture_frame.winfo_ismapped():
-                    self.gui_edge_texture_frame.pack(
-                        padx=2, pady=2, fill="x"
-                    )
+                shown_frame = self.gui_edge_texture_frame
                 self.do_updates = False
                 self.gui_edge_texture_dropdown.set(
                     current_level.edge_wall_texture_name
@@ -799,6 +1285,25 @@ class LevelDesignerApp:
                         current_level.edge_wall_texture_name
                     ]
                 )
+        for frame in (self.gui_monster_wait_frame, self.gui_texture_frame,
+                      self.gui_edge_texture_frame,
+                      self.gui_decoration_texture_frame):
+            self.set_frame_packed(frame, frame is shown_frame)
+
+    def set_frame_packed(self, frame: tkinter.Frame, packed: bool) -> None:
+        """
+        Show or hide one of the frames in the properties frame. Nothing is
+        done if the frame is already in the requested state, so frames that
+        stay shown aren't removed and laid out again.
+        """
+        if packed == (frame in self._packed_frames):
+            return
+        if packed:
+            frame.pack(padx=2, pady=2, fill="x")
+            self._packed_frames.add(frame)
+        else:
+            frame.forget()
+            self._packed_frames.discard(frame)
 
     def select_tool(self, new_tool: int) -> None:
         """
@@ -810,27 +1315,100 @@ class LevelDesignerApp:
             self.current_tool = new_tool
             self.tool_buttons[self.current_tool].config(state=tkinter.DISABLED)
 
-    def add_to_undo(self) -> None:
+    def add_to_undo(self, all_levels: bool = False,
+                    attributes: Iterable[str] = (),
+                    tiles: Iterable[Tuple[int, int]] = ()) -> None:
         """
-        Add the state of all the current levels to the undo stack.
-        Also marks the file as having unsaved changes.
+        Add the state of the current level to the undo stack, or the state of
+        every level if all_levels is True. Only the current level needs to be
+        saved for edits to its contents, but adding, removing, or moving
+        levels needs them all. If the names of the only attributes and/or
+        tiles of the current level about to be edited are given, just their
+        values are saved, and edits made by a single drag across the map
+        canvas are all added to the same undo step. Also marks the file as
+        having unsaved changes.
         """
         self.unsaved_changes = True
+        self._tile_roles = None
+        snapshot: Union[bytes, LevelChanges]
+        if all_levels or self.current_level < 0:
+            changed_index = None
+            snapshot = pickle.dumps(self.levels, pickle.HIGHEST_PROTOCOL)
+        elif attributes or tiles:
+            changed_index = self.current_level
+            snapshot = LevelChanges.record(
+                self.levels[self.current_level], attributes, tiles
+            )
+            if self._map_drag_editing:
+                if (self._map_drag_undo is not None
+                        and len(self.undo_stack) > 0
+                        and self.undo_stack[-1][2] is self._map_drag_undo):
+                    self._map_drag_undo.merge_later(snapshot)
+                    return
+                self._map_drag_undo = snapshot
+        else:
+            changed_index = self.current_level
+            pickled_level = pickle.dumps(
+                self.levels[self.current_level], pickle.HIGHEST_PROTOCOL
+            )
+            # Making and reverting the same change repeatedly creates
+            # identical snapshots. Those already in the stack are reused so
+            # that only one copy of each is kept in memory.
+            snapshot = {
+                stored: stored for _, _, stored in self.undo_stack
+                if isinstance(stored, bytes)
+            }.get(pickled_level, pickled_level)
         self.undo_stack.append(
-            (self.current_level, copy.deepcopy(self.levels))
+            (self.current_level, changed_index, snapshot)
         )
         self.gui_undo_button.config(state=tkinter.ACTIVE)
 
+    def _get_tile_roles(self) -> Dict[Tuple[int, int], int]:
+        """
+        Get the result of get_tile_roles for the current level, only working
+        it out again if the level has changed since it was last needed.
+        """
+        current_level = self.levels[self.current_level]
+        if (self._tile_roles is None
+                or self._tile_roles_level is not current_level):
+            self._tile_roles = get_tile_roles(current_level)
+            self._tile_roles_level = current_level
+        return self._tile_roles
+
+    def add_slider_undo(self, attributes: Iterable[str] = ()) -> None:
+        """
+        Add the state of the current level, or just the given attributes of
+        it, to the undo stack, unless the slider currently being dragged has
+        already done so.
+        """
+        if not self._slider_undo_taken:
+            self.add_to_undo(attributes=attributes)
+            self._slider_undo_taken = True
+
     def perform_undo(self) -> None:
         """
         Revert the current level to its state before the most recent non-undone
         action.
         """
         if len(self.undo_stack) > 0:
-            self.current_level, self.levels = self.undo_stack.pop(-1)
-            self.update_level_list()
-            self.update_map_canvas()
-            self.update_properties_frame()
+            previous_level = self.current_level
+            self.current_level, changed_index, snapshot = (
+                self.undo_stack.pop()
+            )
+            self._tile_roles = None
+            if isinstance(snapshot, LevelChanges):
+                # Changes are only ever recorded against a single level.
+                assert changed_index is not None
+                snapshot.restore(self.levels[changed_index])
+            elif changed_index is None:
+                self.levels = pickle.loads(snapshot)
+            else:
+                self.levels[changed_index] = pickle.loads(snapshot)
+            if changed_index is None or previous_level != self.current_level:
+                self.schedule_redraw(True)
+            else:
+                self.update_level_list_row(changed_index)
+                self.schedule_redraw()
         if len(self.undo_stack) == 0:
             self.gui_undo_button.config(state=tkinter.DISABLED)
 
@@ -849,8 +1427,7 @@ class LevelDesignerApp:
             self.do_updates = False
             self.gui_map_zoom_slider.set(1.0)
             self.do_updates = True
-            self.update_map_canvas()
-            self.update_properties_frame()
+            self.schedule_redraw()
 
     def on_map_canvas_mouse(self, event: tkinter.Event, was_click: bool
                             ) -> None:
@@ -859,24 +1436,21 @@ class LevelDesignerApp:
         while the left mouse button is held down. Handles the event based on
         the currently selected tool.
         """
+        if was_click:
+            self._map_drag_undo = None
         if self.current_level < 0:
             return
         current_level = self.levels[self.current_level]
-        tile_width = (
-            self._cfg.viewport_width // max(
-                (current_level.dimensions[0] * self.zoom_level).__trunc__(), 1
-            )
-        )
-        tile_height = (
-            self._cfg.viewport_height // max(
-                (current_level.dimensions[1] * self.zoom_level).__trunc__(), 1
-            )
-        )
+        # Motion events arrive constantly while dragging, so the dimensions
+        # are looked up once and bounds are checked without a method call.
+        level_width, level_height = current_level.dimensions
+        tile_width, tile_height = self.get_tile_size(current_level.dimensions)
         clicked_tile = (
             (event.x - 2) // tile_width + self.scroll_offset[0],
             (event.y - 2) // tile_height + self.scroll_offset[1]
         )
-        if not current_level.is_coord_in_bounds(clicked_tile):
+        if not (0 <= clicked_tile[0] < level_width
+                and 0 <= clicked_tile[1] < level_height):
             return
         if not was_click and clicked_tile == self.last_visited_tile:
             return
@@ -917,127 +1491,193 @@ class LevelDesignerApp:
                             (try_offset[0], try_offset[1]))):
                     # New scroll offset remains in level boundaries
                     self.scroll_offset = try_offset
-                    self.update_map_canvas()
                     break
-        elif self.current_tool == WALL:
-            if not is_tile_free(current_level, clicked_tile):
-                return
-            self.add_to_undo()
-            current_level[clicked_tile, level.PLAYER_COLLIDE] = not isinstance(
-                current_level[clicked_tile, level.PRESENCE], tuple
-            )
-            current_level[clicked_tile, level.MONSTER_COLLIDE] = (
-                not isinstance(
-                    current_level[clicked_tile, level.PRESENCE], tuple
-                )
-            )
-            current_level[clicked_tile, level.PRESENCE] = (
-                None
-                if isinstance(
-                    current_level[clicked_tile, level.PRESENCE], tuple) else
-                (current_level.edge_wall_texture_name,) * 4
-            )
-        elif self.current_tool == COLLISION_PLAYER:
-            if (clicked_tile != current_level.monster_start
-                    and not is_tile_free(current_level, clicked_tile)):
-                return
-            self.add_to_undo()
-            current_level[clicked_tile, level.PLAYER_COLLIDE] = (
-                not current_level[clicked_tile, level.PLAYER_COLLIDE]
-            )
-        elif self.current_tool == COLLISION_MONSTER:
-            if clicked_tile == current_level.monster_start:
-                return
-            self.add_to_undo()
-            current_level[clicked_tile, level.MONSTER_COLLIDE] = (
-                not current_level[clicked_tile, level.MONSTER_COLLIDE]
-            )
-        elif self.current_tool == START:
-            if (current_level[clicked_tile, level.PRESENCE]
-                    or current_level[clicked_tile, level.PLAYER_COLLIDE]
-                    or not is_tile_free(current_level, clicked_tile)):
+        else:
+            tool_handler = self._tool_handlers.get(self.current_tool)
+            if tool_handler is None:
                 return
-            self.add_to_undo()
-            current_level.start_point = clicked_tile
-        elif self.current_tool == END:
-            if (current_level[clicked_tile, level.PRESENCE]
-                    or current_level[clicked_tile, level.PLAYER_COLLIDE]
-                    or not is_tile_free(current_level, clicked_tile)):
+            self._map_drag_editing = True
+            try:
+                level_changed = tool_handler(current_level, clicked_tile)
+            finally:
+                # Edits made after a failed handler aren't part of the drag.
+                self._map_drag_editing = False
+            if not level_changed:
                 return
-            self.add_to_undo()
-            current_level.end_point = clicked_tile
-        elif self.current_tool == KEY:
-            if clicked_tile in current_level.original_exit_keys:
-                self.add_to_undo()
-                current_level.original_exit_keys = (
-                    current_level.original_exit_keys - {clicked_tile}
-                )
-            else:
-                if (current_level[clicked_tile, level.PRESENCE]
-                        or current_level[clicked_tile, level.PLAYER_COLLIDE]
-                        or not is_tile_free(current_level, clicked_tile)):
-                    return
-                self.add_to_undo()
-                current_level.original_exit_keys = (
-                    current_level.original_exit_keys | {clicked_tile}
-                )
-        elif self.current_tool == SENSOR:
-            if clicked_tile in current_level.original_key_sensors:
-                self.add_to_undo()
-                current_level.original_key_sensors = (
-                    current_level.original_key_sensors - {clicked_tile}
-                )
-            else:
-                if (current_level[clicked_tile, level.PRESENCE]
-                        or current_level[clicked_tile, level.PLAYER_COLLIDE]
-                        or not is_tile_free(current_level, clicked_tile)):
-                    return
-                self.add_to_undo()
-                current_level.original_key_sensors = (
-                    current_level.original_key_sensors | {clicked_tile}
-                )
-        elif self.current_tool == GUN:
-            if clicked_tile in current_level.original_guns:
-                self.add_to_undo()
-                current_level.original_guns = (
-                    current_level.original_guns - {clicked_tile}
-                )
-            else:
-                if (current_level[clicked_tile, level.PRESENCE]
-                        or current_level[clicked_tile, level.PLAYER_COLLIDE]
-                        or not is_tile_free(current_level, clicked_tile)):
-                    return
-                self.add_to_undo()
-                current_level.original_guns = (
-                    current_level.original_guns | {clicked_tile}
-                )
-        elif self.current_tool == MONSTER:
-            if clicked_tile == current_level.monster_start:
-                self.add_to_undo()
-                current_level.monster_start = None
-                current_level.monster_wait = None
-            else:
-                if (current_level[clicked_tile, level.PRESENCE]
-                        or current_level[clicked_tile, level.MONSTER_COLLIDE]
-                        or not is_tile_free(current_level, clicked_tile)):
-                    return
-                self.add_to_undo()
-                current_level.monster_start = clicked_tile
-                if current_level.monster_wait is None:
-                    current_level.monster_wait = 10.0
-        elif self.current_tool == DECORATION:
-            if clicked_tile in current_level.decorations:
-                self.add_to_undo()
-                current_level.decorations.pop(clicked_tile)
-            else:
-                if (current_level[clicked_tile, level.PRESENCE]
-                        or not is_tile_free(current_level, clicked_tile)):
-                    return
-                self.add_to_undo()
-                current_level.decorations[clicked_tile] = 'placeholder'
+        self.schedule_redraw()
+
+    def schedule_redraw(self, level_list: bool = False) -> None:
+        """
+        Update the map canvas and properties frame once tkinter is idle, as
+        well as the level ListBox if level_list is True.
+        Dragging the mouse across the map canvas can edit many tiles between
+        frames, and any number of actions taken before tkinter is next idle
+        will all be drawn by a single update.
+        """
+        self._level_list_outdated = self._level_list_outdated or level_list
+        if self._redraw_update is None:
+            self._redraw_update = self.window.after_idle(self.redraw)
+
+    def redraw(self) -> None:
+        """
+        Update the map canvas and properties frame, usually as scheduled by
+        schedule_redraw.
+        """
+        self._redraw_update = None
+        if self._level_list_outdated:
+            self._level_list_outdated = False
+            self.update_level_list()
         self.update_map_canvas()
         self.update_properties_frame()
 
+    def _can_place_object(self, current_level: level.Level,
+                          tile: Tuple[int, int]) -> bool:
+        """
+        Determine whether a tile in the current level is empty, free, and
+        able to be walked on by the player, so that an object can be placed
+        on it.
+        """
+        return (
+            not current_level[tile, level.PRESENCE]
+            and not current_level[tile, level.PLAYER_COLLIDE]
+            and is_tile_free(current_level, tile, self._get_tile_roles())
+        )
+
+    def _toggle_wall(self, current_level: level.Level, tile: Tuple[int, int]
+                     ) -> bool:
+        """
+        Add or remove a wall from a tile in the current level. Returns True
+        if the level was changed.
+        """
+        if not is_tile_free(current_level, tile, self._get_tile_roles()):
+            return False
+        had_wall = isinstance(current_level[tile, level.PRESENCE], tuple)
+        self.add_to_undo(tiles=(tile,))
+        current_level[tile, level.PLAYER_COLLIDE] = not had_wall
+        current_level[tile, level.MONSTER_COLLIDE] = not had_wall
+        current_level[tile, level.PRESENCE] = (
+            None if had_wall else (current_level.edge_wall_texture_name,) * 4
+        )
+        return True
+
+    def _toggle_player_collision(self, current_level: level.Level,
+                                 tile: Tuple[int, int]) -> bool:
+        """
+        Toggle whether the player can move through a tile in the current
+        level. Returns True if the level was changed.
+        """
+        if (tile != current_level.monster_start and not is_tile_free(
+                current_level, tile, self._get_tile_roles())):
+            return False
+        self.add_to_undo(tiles=(tile,))
+        current_level[tile, level.PLAYER_COLLIDE] = (
+            not current_level[tile, level.PLAYER_COLLIDE]
+        )
+        return True
+
+    def _toggle_monster_collision(self, current_level: level.Level,
+                                  tile: Tuple[int, int]) -> bool:
+        """
+        Toggle whether the monster can move through a tile in the current
+        level. Returns True if the level was changed.
+        """
+        if tile == current_level.monster_start:
+            return False
+        self.add_to_undo(tiles=(tile,))
+        current_level[tile, level.MONSTER_COLLIDE] = (
+            not current_level[tile, level.MONSTER_COLLIDE]
+        )
+        return True
+
+    def _move_start_point(self, current_level: level.Level,
+                          tile: Tuple[int, int]) -> bool:
+        """
+        Move the start point of the current level to a tile. Returns True if
+        the level was changed.
+        """
+        if not self._can_place_object(current_level, tile):
+            return False
+        self.add_to_undo(attributes=("start_point",))
+        current_level.start_point = tile
+        return True
+
+    def _move_end_point(self, current_level: level.Level,
+                        tile: Tuple[int, int]) -> bool:
+        """
+        Move the end point of the current level to a tile. Returns True if
+        the level was changed.
+        """
+        if not self._can_place_object(current_level, tile):
+            return False
+        self.add_to_undo(attributes=("end_point",))
+        current_level.end_point = tile
+        return True
+
+    def _toggle_tile_set_item(self, current_level: level.Level,
+                              tile: Tuple[int, int]) -> bool:
+        """
+        Add or remove the key, sensor, or gun that the current tool places
+        from a tile in the current level. Returns True if the level was
+        changed.
+        """
+        attribute = TILE_SET_ATTRIBUTES[self.current_tool]
+        tile_set: FrozenSet[Tuple[int, int]] = getattr(
+            current_level, attribute
+        )
+        if tile in tile_set:
+            self.add_to_undo(attributes=(attribute,))
+            setattr(current_level, attribute, tile_set - {tile})
+            return True
+        if not self._can_place_object(current_level, tile):
+            return False
+        self.add_to_undo(attributes=(attribute,))
+        setattr(current_level, attribute, tile_set | {tile})
+        return True
+
+    def _toggle_monster(self, current_level: level.Level,
+                        tile: Tuple[int, int]) -> bool:
+        """
+        Add the monster to a tile in the current level, or remove it if it is
+        already there. Returns True if the level was changed.
+        """
+        if tile == current_level.monster_start:
+            self.add_to_undo(
+                attributes=("monster_start", "monster_wait")
+            )
+            current_level.monster_start = None
+            current_level.monster_wait = None
+            return True
+        if (current_level[tile, level.PRESENCE]
+                or current_level[tile, level.MONSTER_COLLIDE]
+                or not is_tile_free(
+                    current_level, tile, self._get_tile_roles())):
+            return False
+        self.add_to_undo(
+            attributes=("monster_start", "monster_wait")
+        )
+        current_level.monster_start = tile
+        if current_level.monster_wait is None:
+            current_level.monster_wait = 10.0
+        return True
+
+    def _toggle_decoration(self, current_level: level.Level,
+                           tile: Tuple[int, int]) -> bool:
+        """
+        Add or remove a decoration from a tile in the current level. Returns
+        True if the level was changed.
+        """
+        if tile in current_level.decorations:
+            self.add_to_undo(attributes=("decorations",))
+            current_level.decorations.pop(tile)
+            return True
+        if (current_level[tile, level.PRESENCE]
+                or not is_tile_free(
+                    current_level, tile, self._get_tile_roles())):
+            return False
+        self.add_to_undo(attributes=("decorations",))
+        current_level.decorations[tile] = 'placeholder'
+        return True
+
     def bulk_select_all_walls(self, _: Optional[tkinter.Event] = None) -> None:
         """
         Called when the user presses 'a'. Bulk selects all walls in the current
@@ -1059,89 +1699,84 @@ class LevelDesignerApp:
 
     def dimensions_changed(self, _: str) -> None:
         """
-        Called when the user updates the dimensions of the level.
+        Called when the user updates the dimensions of the level. The change
+        is applied once tkinter is idle, so that dragging a slider across
+        many values only resizes the level once per batch of events.
         """
         if self.current_level < 0 or not self.do_updates:
             return
-        new_dimensions = (
+        if self._dimensions_update is None:
+            self._dimensions_update = self.window.after_idle(
+                self.apply_dimensions_change
+            )
+
+    def apply_dimensions_change(self) -> None:
+        """
+        Resize the current level to match the dimension sliders.
+        """
+        self._dimensions_update = None
+        if self.current_level < 0:
+            return
+        current_level = self.levels[self.current_level]
+        slider_dimensions = (
             round(self.gui_dimension_width_slider.get()),
             round(self.gui_dimension_height_slider.get())
         )
-        current_level = self.levels[self.current_level]
+        if slider_dimensions == current_level.dimensions:
+            return
+        # Don't allow the user to shrink start/end points or the monster out
+        # of bounds.
+        required_points = [current_level.start_point, current_level.end_point]
+        if current_level.monster_start is not None:
+            required_points.append(current_level.monster_start)
+        new_dimensions = (
+            max(slider_dimensions[0], *(x[0] + 1 for x in required_points)),
+            max(slider_dimensions[1], *(x[1] + 1 for x in required_points))
+        )
         if new_dimensions == current_level.dimensions:
+            # Move the sliders back to where they were.
+            self.bulk_wall_selection = []
+            self.schedule_redraw()
             return
-        self.add_to_undo()
+        self.add_slider_undo()
         self.bulk_wall_selection = []
-        old_dimensions = current_level.dimensions
         current_level.dimensions = new_dimensions
-        if (not current_level.is_coord_in_bounds(current_level.start_point) or
-                not current_level.is_coord_in_bounds(current_level.end_point)):
-            # Don't allow the user to shrink start/end points out of bounds.
-            current_level.dimensions = (
-                max(
-                    current_level.start_point[0] + 1,
-                    current_level.end_point[0] + 1, current_level.dimensions[0]
-                ),
-                max(
-                    current_level.start_point[1] + 1,
-                    current_level.end_point[1] + 1, current_level.dimensions[1]
-                )
-            )
-        monster_start = current_level.monster_start
-        if (monster_start is not None
-                and not current_level.is_coord_in_bounds(monster_start)):
-            current_level.dimensions = (
-                max(
-                    monster_start[0] + 1, current_level.dimensions[0]
-                ),
-                max(
-                    monster_start[1] + 1, current_level.dimensions[1]
-                )
-            )
-        if old_dimensions == current_level.dimensions:
-            self.perform_undo()
-            return
-        # Remove out of bounds keys, sensors, and guns.
+        width, height = current_level.dimensions
+        # Remove out of bounds keys, sensors, and guns. Resizing only moves
+        # the right and bottom edges, so only they need to be checked.
+        self._tile_roles = None
         current_level.original_exit_keys = frozenset(
-            x for x in current_level.original_exit_keys
-            if current_level.is_coord_in_bounds(x)
+            (x, y) for x, y in current_level.original_exit_keys
+            if x < width and y < height
         )
         current_level.original_key_sensors = frozenset(
-            x for x in current_level.original_key_sensors
-            if current_level.is_coord_in_bounds(x)
+            (x, y) for x, y in current_level.original_key_sensors
+            if x < width and y < height
         )
         current_level.original_guns = frozenset(
-            x for x in current_level.original_guns
-            if current_level.is_coord_in_bounds(x)
-        )
-        # Remove excess rows
-        current_level.wall_map = (
-            current_level.wall_map[:current_level.dimensions[1]]
-        )
-        current_level.collision_map = (
-            current_level.collision_map[:current_level.dimensions[1]]
-        )
-        # Pad new rows with empty space
-        for __ in range(
-                current_level.dimensions[1] - len(current_level.wall_map)):
-            current_level.wall_map.append([None] * current_level.dimensions[0])
-            current_level.collision_map.append(
-                [(False, False)] * current_level.dimensions[0]
-            )
-        for index, row in enumerate(current_level.wall_map):
-            # Remove excess columns
-            current_level.wall_map[index] = row[:current_level.dimensions[0]]
-            # Pad new columns with empty space
-            for __ in range(current_level.dimensions[0] - len(row)):
-                current_level.wall_map[index].append(None)
-        for index, collision_row in enumerate(current_level.collision_map):
-            # Remove excess columns
-            current_level.collision_map[index] = (
-                collision_row[:current_level.dimensions[0]]
+            (x, y) for x, y in current_level.original_guns
+            if x < width and y < height
+        )
+        # Remove excess rows and pad new rows with empty space
+        del current_level.wall_map[height:]
+        del current_level.collision_map[height:]
+        current_level.wall_map.extend(
+            [None] * width
+            for _ in range(height - len(current_level.wall_map))
+        )
+        current_level.collision_map.extend(
+            [(False, False)] * width
+            for _ in range(height - len(current_level.collision_map))
+        )
+        # Remove excess columns and pad new columns with empty space
+        for row in current_level.wall_map:
+            del row[width:]
+            row.extend([None] * (width - len(row)))
+        for collision_row in current_level.collision_map:
+            del collision_row[width:]
+            collision_row.extend(
+                [(False, False)] * (width - len(collision_row))
             )
-            # Pad new columns with empty space
-            for __ in range(current_level.dimensions[0] - len(collision_row)):
-                current_level.collision_map[index].append((False, False))
         if not current_level.is_coord_in_bounds(self.current_tile):
             self.current_tile = (-1, -1)
         self.zoom_level = 1.0
@@ -1149,25 +1784,47 @@ class LevelDesignerApp:
         self.do_updates = False
         self.gui_map_zoom_slider.set(1.0)
         self.do_updates = True
-        self.update_properties_frame()
-        self.update_level_list()
-        self.update_map_canvas()
+        self.update_level_list_row(self.current_level)
+        self.schedule_redraw()
 
     def monster_time_change(self, new_time: str) -> None:
         """
         Called when the user updates the monster spawn delay. Due to how
-        tkinter scales work, new_time is given as a string.
+        tkinter scales work, new_time is given as a string. Like
+        dimensions_changed, the change is applied once tkinter is idle.
         """
         if self.current_level < 0 or not self.do_updates:
             return
-        rounded_time = round(float(new_time)) * 5
+        self._pending_monster_time = new_time
+        if self._monster_time_update is None:
+            self._monster_time_update = self.window.after_idle(
+                self.apply_monster_time_change
+            )
+
+    def apply_monster_time_change(self) -> None:
+        """
+        Set the monster spawn delay of the current level to the most recent
+        value given to monster_time_change.
+        """
+        self._monster_time_update = None
+        if self.current_level < 0:
+            return
+        rounded_time = round(float(self._pending_monster_time)) * 5
         current_level = self.levels[self.current_level]
         if rounded_time == current_level.monster_wait:
             return
-        self.add_to_undo()
+        self.add_slider_undo(attributes=("monster_wait",))
         current_level.monster_wait = rounded_time
         self.update_properties_frame()
 
+    def slider_pressed(self, _: tkinter.Event) -> None:
+        """
+        Called when the user presses a mouse button or key on a slider that
+        edits the level, so that the movement it starts is given its own undo
+        entry.
+        """
+        self._slider_undo_taken = False
+
     def texture_change(self, _: tkinter.Event) -> None:
         """
         Called when the user changes the texture for a wall side.
@@ -1175,7 +1832,7 @@ class LevelDesignerApp:
         if (self.current_level < 0 or -1 in self.current_tile
                 or not self.do_updates):
             return
-        self.add_to_undo()
+        self.add_to_undo(tiles=self.bulk_wall_selection)
         current_level = self.levels[self.current_level]
         for current_tile in self.bulk_wall_selection:
             tile = current_level[current_tile, level.PRESENCE]
@@ -1195,7 +1852,7 @@ class LevelDesignerApp:
         """
         if self.current_level < 0 or not self.do_updates:
             return
-        self.add_to_undo()
+        self.add_to_undo(attributes=("edge_wall_texture_name",))
         self.levels[self.current_level].edge_wall_texture_name = (
             self.gui_edge_texture_dropdown.get()
         )
@@ -1208,7 +1865,7 @@ class LevelDesignerApp:
         if (self.current_level < 0 or -1 in self.current_tile
                 or not self.do_updates):
             return
-        self.add_to_undo()
+        self.add_to_undo(attributes=("decorations",))
         self.levels[self.current_level].decorations[self.current_tile] = (
             self.gui_decoration_texture_dropdown.get()
         )
@@ -1243,15 +1900,17 @@ class LevelDesignerApp:
         """
         Create an empty level after the currently selected level.
         """
-        self.add_to_undo()
+        self.add_to_undo(True)
+        # A new level has no keys, sensors, or guns. As the same frozen set
+        # is immutable it can be shared between all of them, and Level will
+        # reuse it for the originals instead of making copies.
+        no_tiles: FrozenSet[Tuple[int, int]] = frozenset()
         self.levels.insert(self.current_level + 1, level.Level(
             (10, 10), [[None] * 10 for _ in range(10)],
-            [[(False, False)] * 10 for _ in range(10)], (0, 0), (1, 0), set(),
-            set(), set(), {}, None, 'placeholder'
+            [[(False, False)] * 10 for _ in range(10)], (0, 0), (1, 0),
+            no_tiles, no_tiles, no_tiles, {}, None, 'placeholder'
         ))
-        self.update_level_list()
-        self.update_map_canvas()
-        self.update_properties_frame()
+        self.schedule_redraw(True)
 
     def delete_level(self) -> None:
         """
@@ -1264,12 +1923,10 @@ class LevelDesignerApp:
                 + "While it may be temporarily possible to undo, "
                 + "it should not be depended upon!"):
             return
-        self.add_to_undo()
+        self.add_to_undo(True)
         self.levels.pop(self.current_level)
         self.current_level = -1
-        self.update_level_list()
-        self.update_map_canvas()
-        self.update_properties_frame()
+        self.schedule_redraw(True)
 
     def move_level(self, index: int, relative: bool) -> None:
         """
@@ -1283,20 +1940,32 @@ class LevelDesignerApp:
             target = index
         if target < 0 or target >= len(self.levels):
             return
-        self.add_to_undo()
+        self.add_to_undo(True)
         self.levels.insert(target, self.levels.pop(self.current_level))
         self.current_level = target
-        self.update_level_list()
+        self.schedule_redraw(True)
 
     def on_closing(self) -> None:
         """
         When closing the window, prompt the user first if they have unsaved
         changes.
         """
+        if self._io_thread is not None:
+            # Let the file finish saving so that a failed save can still be
+            # reported before the window is closed.
+            self._io_thread.join()
+            if self._io_poll is not None:
+                self.window.after_cancel(self._io_poll)
+            self._poll_io_queue()
         if self.unsaved_changes and not tkinter.messagebox.askyesno(
                 "Unsaved changes", "You currently have unsaved changes, "
                                    + "are you sure you wish to exit? "):
             return
+        # Pending updates would otherwise run against the destroyed window.
+        for pending_update in (self._redraw_update, self._dimensions_update,
+                               self._monster_time_update):
+            if pending_update is not None:
+                self.window.after_cancel(pending_update)
         self.window.destroy()
 
 
@@ -293,18 +293,14 @@ def maze_game(*, level_json_path: str = "maze_levels.json",
                     if event.key == pygame.K_f:
                         if not (levels[current_level].won
                                 or levels[current_level].killed or is_multi):
-                            grid_coords = levels[
+                            grid_x, grid_y = levels[
                                 current_level
                             ].player_grid_coords
-                            if (grid_coords in
-                                    levels[current_level].player_flags):
-                                levels[current_level].player_flags.remove(
-                                    grid_coords
-                                )
+                            player_flags = levels[current_level].player_flags
+                            if player_flags[grid_y][grid_x]:
+                                player_flags[grid_y][grid_x] = 0
                             else:
-                                levels[current_level].player_flags.add(
-                                    grid_coords
-                                )
+                                player_flags[grid_y][grid_x] = 1
                                 random.choice(
                                     resources.flag_place_sounds
                                 ).play()
@@ -221,7 +221,8 @@ def get_first_collision(current_level: level.Level,
                             sprite_apparent_pos
                         ), current_tile, MONSTER
                     ))
-                if current_tile in current_level.player_flags:
+                if current_level.player_flags[current_tile[1]][
+                        current_tile[0]]:
                     sprites.append(SpriteCollision(
                         sprite_apparent_pos,
                         no_sqrt_coord_distance(
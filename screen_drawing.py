@@ -478,7 +478,7 @@ def draw_map(screen: pygame.Surface, cfg: Config, current_level: Level,
                 colour = GREY
             elif current_level.monster_start == (x, y):
                 colour = DARK_GREEN
-            elif (x, y) in current_level.player_flags:
+            elif current_level.player_flags[y][x]:
                 colour = LIGHT_BLUE
             elif current_level.start_point == (x, y):
                 colour = RED
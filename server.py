@@ -97,9 +97,11 @@ def maze_server(*, level_json_path: str = "maze_levels.json",
                     )
                 else:
                     grid_pos = players[player_key].grid_pos
-                    current_level.exit_keys.discard(grid_pos)
-                    current_level.key_sensors.discard(grid_pos)
-                    current_level.guns.discard(grid_pos)
+                    # Pickup sets are frozen after a reset until something is
+                    # picked up, so subtract from them instead of discarding.
+                    current_level.exit_keys -= {grid_pos}
+                    current_level.key_sensors -= {grid_pos}
+                    current_level.guns -= {grid_pos}
                     if current_level.monster_coords is None:
                         monster_coords = (-1, -1)
                     else: